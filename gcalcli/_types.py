@@ -20,6 +20,9 @@ if TYPE_CHECKING:
     # XXX: having all_cals available as an invariant would be better than
     # setting total=False
     class Cache(TypedDict, total=False):
+        version: int
+        mtime: float
+        etag: str
         all_cals: List[CalendarListEntry]
 else:
     CalendarListEntry = Dict[str, Any]
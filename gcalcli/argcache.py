@@ -0,0 +1,151 @@
+"""Cache of parsed command line arguments.
+
+Parsing the rc files and the command line is repeated on every invocation
+even though its inputs rarely change. The resulting namespace is pickled,
+keyed on everything it depends on: the program version, argv, the rc files
+and any @files they refer to, and the terminal width and locale used for some
+defaults.
+
+Parsing a single subcommand takes about a millisecond, so the cache is opt-in
+(GCALCLI_ARGCACHE). Defaults derived from other parts of the environment are
+not part of the key; delete the cache file when they change.
+"""
+
+from datetime import datetime
+import hashlib
+import io
+import os
+import pickle
+from shutil import get_terminal_size
+import tempfile
+
+from . import __version__
+from .deprecations import USED_DEPRECATED_OPT
+
+# number of distinct command lines remembered
+CACHE_SIZE = 32
+LOCALE_VARS = ('LC_ALL', 'LC_TIME', 'LANG')
+# the cache is only used when this is set to a non-empty value
+ENABLE_VAR = 'GCALCLI_ARGCACHE'
+
+
+def get_cache_file():
+    cache_home = (os.environ.get('XDG_CACHE_HOME') or
+                  os.path.expanduser('~/.cache'))
+    return os.path.join(cache_home, 'gcalcli', 'argparse.pkl')
+
+
+def _stat_key(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _flagfile_keys(args, seen=None):
+    """Stat every @file in args and, recursively, the @files they name.
+
+    argparse reads these itself (fromfile_prefix_chars='@'), relative to the
+    working directory and with one argument per line.
+    """
+    if seen is None:
+        seen = set()
+    keys = []
+    for arg in args:
+        if not arg.startswith('@'):
+            continue
+        path = os.path.abspath(arg[1:])
+        if path in seen:
+            continue
+        seen.add(path)
+        keys.append((path, _stat_key(path)))
+        try:
+            with open(path) as flagfile:
+                lines = flagfile.read().splitlines()
+        except (OSError, UnicodeDecodeError):
+            continue
+        keys.extend(_flagfile_keys(lines, seen))
+    return keys
+
+
+def _config_rc_key(parsed_args):
+    if not parsed_args.config_folder:
+        return None
+    return _flagfile_keys(['@' + os.path.join(
+            os.path.expanduser(parsed_args.config_folder), 'gcalclirc')])
+
+
+def enabled():
+    return bool(os.environ.get(ENABLE_VAR))
+
+
+def _cacheable(parsed_args):
+    # Relative dates ("tomorrow") must be evaluated on every run and open
+    # files cannot be pickled. Deprecated options have to warn every time.
+    if getattr(parsed_args, USED_DEPRECATED_OPT, False):
+        return False
+    return not any(isinstance(value, (datetime, io.IOBase))
+                   for value in vars(parsed_args).values())
+
+
+def get_key(argv, gcalclirc):
+    # the rc file is read as an @file, so it is covered along with argv's
+    state = (__version__, tuple(argv),
+             _flagfile_keys(['@' + gcalclirc] + list(argv)),
+             get_terminal_size().columns,
+             tuple(os.environ.get(var, '') for var in LOCALE_VARS))
+    return hashlib.blake2b(repr(state).encode(), digest_size=16).hexdigest()
+
+
+def _read_cache():
+    try:
+        with open(get_cache_file(), 'rb') as _cache_:
+            cache = pickle.load(_cache_)
+    except Exception:
+        # missing, unreadable or written by an incompatible version
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def load(key):
+    """Return the cached (parsed_args, unparsed) for key, or None."""
+    entry = _read_cache().get(key)
+    if entry is None:
+        return None
+
+    config_rc_key, parsed_args, unparsed = entry
+    # the config folder's rc file is only known once argv has been parsed
+    if config_rc_key != _config_rc_key(parsed_args):
+        return None
+    return parsed_args, unparsed
+
+
+def store(key, parsed_args, unparsed):
+    if not _cacheable(parsed_args):
+        return
+
+    cache = _read_cache()
+    cache.pop(key, None)
+    cache[key] = (_config_rc_key(parsed_args), parsed_args, unparsed)
+    while len(cache) > CACHE_SIZE:
+        del cache[next(iter(cache))]
+
+    cache_file = get_cache_file()
+    cache_dir = os.path.dirname(cache_file)
+    try:
+        data = pickle.dumps(cache, protocol=pickle.HIGHEST_PROTOCOL)
+        os.makedirs(cache_dir, exist_ok=True)
+        # mkstemp creates the file readable by the owner only, as parsed
+        # arguments may hold the client id and secret; replacing the cache in
+        # one step keeps concurrent runs from reading a partial write
+        fd, tmp_file = tempfile.mkstemp(dir=cache_dir, prefix='.argparse.')
+        try:
+            with os.fdopen(fd, 'wb') as _cache_:
+                _cache_.write(data)
+            os.replace(tmp_file, cache_file)
+        except BaseException:
+            os.unlink(tmp_file)
+            raise
+    except (OSError, pickle.PicklingError, TypeError, AttributeError):
+        pass
@@ -43,6 +43,9 @@ PROGRAM_OPTIONS = {
         '--nocache': {'action': 'store_false', 'dest': 'use_cache',
                       'default': True,
                       'help': 'Execute command without using cache'},
+        '--cache-ttl': {'default': 3600, 'type': int, 'dest': 'cache_ttl',
+                        'help': 'Seconds before cached data is checked '
+                                'for changes'},
         '--conky': {'action': 'store_true', 'default': False,
                     'help': 'Use Conky color codes'},
         '--nocolor': {'action': 'store_false', 'default': True,
@@ -243,73 +246,50 @@ def handle_unparsed(unparsed, namespace):
     return parser.parse_args(unparsed, namespace=namespace)
 
 
-@parser_allow_deprecated(name='program')
-def get_argument_parser():
-    parser = argparse.ArgumentParser(
-            description='Google Calendar Command Line Interface',
-            formatter_class=argparse.ArgumentDefaultsHelpFormatter,
-            fromfile_prefix_chars='@',
-            parents=[tools.argparser])
-
-    parser.add_argument(
-            '--version', action='version', version='%%(prog)s %s (%s)' %
-            (gcalcli.__version__, gcalcli.__author__))
-
-    # Program level options
-    for option, definition in PROGRAM_OPTIONS.items():
-        parser.add_argument(option, **definition)
-
-    # parent parser types used for subcommands
-    details_parser = get_details_parser()
-    color_parser = get_color_parser()
-
-    # Output parser should imply color parser
-    output_parser = get_output_parser(parents=[color_parser])
-
-    remind_parser = get_remind_parser()
-    cal_query_parser = get_cal_query_parser()
-    updates_parser = get_updates_parser()
-    conflicts_parser = get_conflicts_parser()
-
-    # parsed start and end times
-    start_end_parser = get_start_end_parser()
-
-    # tacks on search text
-    search_parser = get_search_parser()
-
-    sub = parser.add_subparsers(
-            help='Invoking a subcommand with --help prints subcommand usage.',
-            dest='command')
-    sub.required = True
-
+def _add_list_parser(sub, parents):
     sub.add_parser(
-            'list', parents=[color_parser], help='list available calendars',
+            'list', parents=[parents('color')],
+            help='list available calendars',
             description='List available calendars.')
 
+
+def _add_search_parser(sub, parents):
     sub.add_parser(
-            'search', parents=[details_parser, output_parser, search_parser],
+            'search',
+            parents=[parents('details'), parents('output'), parents('search')],
             help='search for events within an optional time period',
             description='Provides case insenstive search for calendar events.')
+
+
+def _add_edit_parser(sub, parents):
     sub.add_parser(
-            'edit', parents=[details_parser, output_parser, search_parser],
+            'edit',
+            parents=[parents('details'), parents('output'), parents('search')],
             help='edit calendar events',
             description='Case insensitive search for items to find and edit '
             'interactively.')
 
+
+def _add_delete_parser(sub, parents):
     delete = sub.add_parser(
-            'delete', parents=[output_parser, search_parser],
+            'delete', parents=[parents('output'), parents('search')],
             help='delete events from the calendar',
             description='Case insensitive search for items to delete '
             'interactively.')
     delete.add_argument(
             '--iamaexpert', action='store_true', help='Probably not')
 
+
+def _add_agenda_parser(sub, parents):
     sub.add_parser(
             'agenda',
-            parents=[details_parser, output_parser, start_end_parser],
+            parents=[parents('details'), parents('output'),
+                     parents('start_end')],
             help='get an agenda for a time period',
             description='Get an agenda for a time period.')
 
+
+def _add_agendaupdate_parser(sub, parents):
     agendaupdate = sub.add_parser(
             'agendaupdate',
             help='update calendar from agenda TSV file',
@@ -317,41 +297,59 @@ def get_argument_parser():
     agendaupdate.add_argument(
         'file', type=argparse.FileType('r'), nargs='?', default=sys.stdin)
 
+
+def _add_updates_parser(sub, parents):
     sub.add_parser(
             'updates',
-            parents=[details_parser, output_parser, updates_parser],
+            parents=[parents('details'), parents('output'),
+                     parents('updates')],
             help='get updates since a datetime for a time period '
             '(defaults to through end of current month)',
             description='Get updates since a datetime for a time period '
             '(default to through end of current month).')
 
+
+def _add_conflicts_parser(sub, parents):
     sub.add_parser(
             'conflicts',
-            parents=[details_parser, output_parser, conflicts_parser],
+            parents=[parents('details'), parents('output'),
+                     parents('conflicts')],
             help='find event conflicts',
             description='Find conflicts between events matching search term '
             '(default from now through 30 days into futures)')
 
+
+def _add_calw_parser(sub, parents):
     calw = sub.add_parser(
-            'calw', parents=[details_parser, output_parser, cal_query_parser],
+            'calw',
+            parents=[parents('details'), parents('output'),
+                     parents('cal_query')],
             help='get a week-based agenda in calendar format',
             description='Get a week-based agenda in calendar format.')
     calw.add_argument('weeks', type=int, default=1, nargs='?')
 
+
+def _add_calm_parser(sub, parents):
     sub.add_parser(
-            'calm', parents=[details_parser, output_parser, cal_query_parser],
+            'calm',
+            parents=[parents('details'), parents('output'),
+                     parents('cal_query')],
             help='get a month agenda in calendar format',
             description='Get a month agenda in calendar format.')
 
+
+def _add_quick_parser(sub, parents):
     quick = sub.add_parser(
-            'quick', parents=[details_parser, remind_parser],
+            'quick', parents=[parents('details'), parents('remind')],
             help='quick-add an event to a calendar',
             description='`quick-add\' an event to a calendar. A single '
             '--calendar must be specified.')
     quick.add_argument('text')
 
+
+def _add_add_parser(sub, parents):
     add = sub.add_parser(
-            'add', parents=[details_parser, remind_parser],
+            'add', parents=[parents('details'), parents('remind')],
             help='add a detailed event to the calendar',
             description='Add an event to the calendar. Some or all metadata '
             'can be passed as options (see optional arguments).  If '
@@ -384,8 +382,10 @@ def get_argument_parser():
             '--noprompt', action='store_false', dest='prompt', default=True,
             help='Don\'t prompt for missing data when adding events')
 
+
+def _add_import_parser(sub, parents):
     _import = sub.add_parser(
-            'import', parents=[remind_parser],
+            'import', parents=[parents('remind')],
             help='import an ics/vcal file to a calendar',
             description='Import from an ics/vcal file; a single --calendar '
             'must be specified.  Reads from stdin when no file argument is '
@@ -398,6 +398,8 @@ def get_argument_parser():
             '--dump', '-d', action='store_true',
             help='Print events and don\'t import')
 
+
+def _add_remind_parser(sub, parents):
     default_cmd = 'notify-send -u critical -i appointment-soon -a gcalcli %s'
     remind = sub.add_parser(
             'remind',
@@ -416,4 +418,92 @@ def get_argument_parser():
             '--use_reminders', action=DeprecatedStoreTrue,
             help=argparse.SUPPRESS)
 
+
+# parent parser types used for subcommands
+PARENT_PARSERS = {
+    'details': get_details_parser,
+    'color': get_color_parser,
+    # Output parser should imply color parser
+    'output': lambda: get_output_parser(parents=[get_color_parser()]),
+    'remind': get_remind_parser,
+    'cal_query': get_cal_query_parser,
+    'updates': get_updates_parser,
+    'conflicts': get_conflicts_parser,
+    # parsed start and end times
+    'start_end': get_start_end_parser,
+    # tacks on search text
+    'search': get_search_parser,
+}
+
+# Subcommand builders, in the order they are listed by --help. Building the
+# subparsers (and their parents) is the bulk of the parser setup cost, so
+# only the ones actually needed get built.
+SUBCOMMANDS = {
+    'list': _add_list_parser,
+    'search': _add_search_parser,
+    'edit': _add_edit_parser,
+    'delete': _add_delete_parser,
+    'agenda': _add_agenda_parser,
+    'agendaupdate': _add_agendaupdate_parser,
+    'updates': _add_updates_parser,
+    'conflicts': _add_conflicts_parser,
+    'calw': _add_calw_parser,
+    'calm': _add_calm_parser,
+    'quick': _add_quick_parser,
+    'add': _add_add_parser,
+    'import': _add_import_parser,
+    'remind': _add_remind_parser,
+}
+
+
+def get_command_name(argv):
+    """Guess the subcommand from the command line without parsing it.
+
+    Returns None unless exactly one known subcommand name appears in argv,
+    e.g. when an option value happens to be named like a subcommand.
+    """
+    found = {arg for arg in argv if arg in SUBCOMMANDS}
+    if len(found) == 1:
+        return found.pop()
+    return None
+
+
+@parser_allow_deprecated(name='program')
+def get_argument_parser(command=None):
+    """Build the program parser.
+
+    If `command` is given, only the subparser for that command is built.
+    """
+    parser = argparse.ArgumentParser(
+            description='Google Calendar Command Line Interface',
+            formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+            fromfile_prefix_chars='@',
+            parents=[tools.argparser])
+
+    parser.add_argument(
+            '--version', action='version', version='%%(prog)s %s (%s)' %
+            (gcalcli.__version__, gcalcli.__author__))
+
+    # Program level options
+    for option, definition in PROGRAM_OPTIONS.items():
+        parser.add_argument(option, **definition)
+
+    parent_parsers = {}
+
+    def parents(name):
+        if name not in parent_parsers:
+            parent_parsers[name] = PARENT_PARSERS[name]()
+        return parent_parsers[name]
+
+    sub = parser.add_subparsers(
+            help='Invoking a subcommand with --help prints subcommand usage.',
+            dest='command')
+    sub.required = True
+
+    if command in SUBCOMMANDS:
+        SUBCOMMANDS[command](sub, parents)
+    else:
+        for add_subparser in SUBCOMMANDS.values():
+            add_subparser(sub, parents)
+
     return parser
@@ -19,39 +19,45 @@
 # Everything you need to know (Google API Calendar v3): http://goo.gl/HfTGQ #
 #                                                                           #
 # ######################################################################### #
-from collections import namedtuple
 import os
 import signal
 import sys
+from typing import NamedTuple
 
-from . import utils
-from .argparsers import get_argument_parser, handle_unparsed
+from . import argcache, utils
+from .argparsers import (get_argument_parser, get_command_name,
+                         handle_unparsed)
 from .exceptions import GcalcliError
-from .gcal import GoogleCalendarInterface
 from .printer import Printer, valid_color_name
 from .validators import (get_input, PARSABLE_DATE, PARSABLE_DURATION, REMINDER,
                          STR_ALLOW_EMPTY, STR_NOT_EMPTY)
 
-CalName = namedtuple('CalName', ['name', 'color'])
+# NOTE: the Google API client (googleapiclient) is expensive to import and
+# only needed once a command runs, so gcal is imported there instead of here.
+
+
+HELP_FLAGS = frozenset(('-h', '--help', '--version'))
+
+
+class CalName(NamedTuple):
+    name: str
+    color: str
 
 
 def parse_cal_names(cal_names):
     cal_colors = {}
     for name in cal_names:
-        cal_color = 'default'
-        parts = name.split('#')
+        parts = name.split('#', 2)
         parts_count = len(parts)
-        if parts_count >= 1:
-            cal_name = parts[0]
-
-        if len(parts) == 2:
-            cal_color = valid_color_name(parts[1])
-
-        if len(parts) > 2:
+        if parts_count > 2:
             raise ValueError('Cannot parse calendar name: "%s"' % name)
 
-        cal_colors[cal_name] = cal_color
-    return [CalName(name=k, color=cal_colors[k]) for k in cal_colors.keys()]
+        if parts_count == 2:
+            cal_colors[parts[0]] = valid_color_name(parts[1])
+        else:
+            cal_colors[parts[0]] = 'default'
+
+    return [CalName(name, color) for name, color in cal_colors.items()]
 
 
 def run_add_prompt(parsed_args, printer):
@@ -83,12 +89,133 @@ def run_add_prompt(parsed_args, printer):
             parsed_args.reminders.append(str(n) + ' ' + m)
 
 
-def main():
-    parser = get_argument_parser()
+def _cmd_list(parsed_args, gcal, printer):
+    gcal.ListAllCalendars()
+
+
+def _cmd_agenda(parsed_args, gcal, printer):
+    gcal.AgendaQuery(start=parsed_args.start, end=parsed_args.end)
+
+
+def _cmd_agendaupdate(parsed_args, gcal, printer):
+    gcal.AgendaUpdate(parsed_args.file)
+
+
+def _cmd_updates(parsed_args, gcal, printer):
+    gcal.UpdatesQuery(
+            last_updated_datetime=parsed_args.since,
+            start=parsed_args.start,
+            end=parsed_args.end)
+
+
+def _cmd_conflicts(parsed_args, gcal, printer):
+    gcal.ConflictsQuery(
+            search_text=parsed_args.text,
+            start=parsed_args.start,
+            end=parsed_args.end)
+
+
+def _cmd_calw(parsed_args, gcal, printer):
+    gcal.CalQuery(
+            parsed_args.command, count=parsed_args.weeks,
+            start_text=parsed_args.start
+    )
+
+
+def _cmd_calm(parsed_args, gcal, printer):
+    gcal.CalQuery(parsed_args.command, start_text=parsed_args.start)
+
+
+def _cmd_quick(parsed_args, gcal, printer):
+    if not parsed_args.text:
+        printer.err_msg('Error: invalid event text\n')
+        sys.exit(1)
+
+    # allow unicode strings for input
+    gcal.QuickAddEvent(
+            parsed_args.text, reminders=parsed_args.reminders
+    )
+
+
+def _cmd_add(parsed_args, gcal, printer):
+    if parsed_args.prompt:
+        run_add_prompt(parsed_args, printer)
+
+    # calculate "when" time:
     try:
-        argv = sys.argv[1:]
-        gcalclirc = os.path.expanduser('~/.gcalclirc')
-        if os.path.exists(gcalclirc):
+        estart, eend = utils.get_times_from_duration(
+                parsed_args.when, parsed_args.duration,
+                parsed_args.allday
+        )
+    except ValueError as exc:
+        printer.err_msg(str(exc))
+        # Since we actually need a valid start and end time in order to
+        # add the event, we cannot proceed.
+        raise
+
+    gcal.AddEvent(parsed_args.title, parsed_args.where, estart, eend,
+                  parsed_args.description, parsed_args.who,
+                  parsed_args.reminders, parsed_args.event_color)
+
+
+def _cmd_search(parsed_args, gcal, printer):
+    gcal.TextQuery(
+            parsed_args.text[0], start=parsed_args.start,
+            end=parsed_args.end
+    )
+
+
+def _cmd_delete(parsed_args, gcal, printer):
+    gcal.ModifyEvents(
+            gcal._delete_event, parsed_args.text[0],
+            start=parsed_args.start, end=parsed_args.end,
+            expert=parsed_args.iamaexpert, batch=True
+    )
+
+
+def _cmd_edit(parsed_args, gcal, printer):
+    gcal.ModifyEvents(
+            gcal._edit_event, parsed_args.text[0],
+            start=parsed_args.start, end=parsed_args.end
+    )
+
+
+def _cmd_remind(parsed_args, gcal, printer):
+    gcal.Remind(
+            parsed_args.minutes, parsed_args.cmd,
+            use_reminders=parsed_args.use_reminders
+    )
+
+
+def _cmd_import(parsed_args, gcal, printer):
+    gcal.ImportICS(
+            parsed_args.verbose, parsed_args.dump,
+            parsed_args.reminders, parsed_args.file, batch=True
+    )
+
+
+COMMAND_HANDLERS = {
+    'list': _cmd_list,
+    'agenda': _cmd_agenda,
+    'agendaupdate': _cmd_agendaupdate,
+    'updates': _cmd_updates,
+    'conflicts': _cmd_conflicts,
+    'calw': _cmd_calw,
+    'calm': _cmd_calm,
+    'quick': _cmd_quick,
+    'add': _cmd_add,
+    'search': _cmd_search,
+    'delete': _cmd_delete,
+    'edit': _cmd_edit,
+    'remind': _cmd_remind,
+    'import': _cmd_import,
+}
+
+
+def _parse_args(parser, argv, gcalclirc):
+    gcalclirc_exists = os.path.exists(gcalclirc)
+    try:
+        if gcalclirc_exists:
             # We want .gcalclirc to be sourced before any other --flagfile
             # params since we may be told to use a specific config folder, we
             # need to store generated argv in temp variable
@@ -98,34 +225,75 @@ def main():
 
         (parsed_args, unparsed) = parser.parse_known_args(tmp_argv)
     except Exception as e:
-        sys.stderr.write(str(e))
-        parser.print_usage()
+        sys.stderr.write('%s\n%s' % (e, parser.format_usage()))
         sys.exit(1)
 
     if parsed_args.config_folder:
-        if not os.path.exists(os.path.expanduser(parsed_args.config_folder)):
-            os.makedirs(os.path.expanduser(parsed_args.config_folder))
-        if os.path.exists(os.path.expanduser('%s/gcalclirc' %
-                                             parsed_args.config_folder)):
-            rc_path = ['@%s/gcalclirc' % parsed_args.config_folder, ]
+        config_rc = os.path.join(
+                os.path.expanduser(parsed_args.config_folder), 'gcalclirc')
+        # Only parse again if the config folder brings in a new rc file,
+        # otherwise the result would be the same.
+        if os.path.exists(config_rc) and not (
+                gcalclirc_exists and os.path.samefile(config_rc, gcalclirc)):
+            rc_path = ['@%s' % config_rc, ]
             if not parsed_args.includeRc:
                 tmp_argv = rc_path + argv
             else:
                 tmp_argv = rc_path + tmp_argv
 
-        (parsed_args, unparsed) = parser.parse_known_args(tmp_argv)
+            (parsed_args, unparsed) = parser.parse_known_args(tmp_argv)
+
+    return parsed_args, unparsed
+
+
+def main():
+    signal.signal(signal.SIGINT, SIGINT_handler)
+
+    argv = sys.argv[1:]
+    command = get_command_name(argv)
+
+    if HELP_FLAGS.intersection(argv):
+        # Only usage or the version gets printed, so neither the rc files
+        # nor the parse cache are needed. argparse exits after printing.
+        get_argument_parser(command).parse_known_args(argv)
+
+    gcalclirc = os.path.expanduser('~/.gcalclirc')
+
+    # the parser is only built when there is no cached parse result
+    parser = None
+    cache_key = cached = None
+    if argcache.enabled():
+        cache_key = argcache.get_key(argv, gcalclirc)
+        cached = argcache.load(cache_key)
+    if cached:
+        (parsed_args, unparsed) = cached
+    else:
+        parser = get_argument_parser(command)
+        (parsed_args, unparsed) = _parse_args(parser, argv, gcalclirc)
+        if cache_key:
+            argcache.store(cache_key, parsed_args, unparsed)
+
+    if parsed_args.config_folder:
+        os.makedirs(os.path.expanduser(parsed_args.config_folder),
+                    exist_ok=True)
 
     printer = Printer(
             conky=parsed_args.conky, use_color=parsed_args.color,
             art_style=parsed_args.lineart
     )
 
+    # fail before doing any work (e.g. authenticating) on unknown commands
+    if parsed_args.command not in COMMAND_HANDLERS:
+        printer.err_msg('Error: unknown command "%s"\n' % parsed_args.command)
+        sys.exit(2)
+
     if unparsed:
         try:
             parsed_args = handle_unparsed(unparsed, parsed_args)
         except Exception as e:
-            sys.stderr.write(str(e))
-            parser.print_usage()
+            if parser is None:
+                parser = get_argument_parser(command)
+            sys.stderr.write('%s\n%s' % (e, parser.format_usage()))
             sys.exit(1)
 
     if parsed_args.locale:
@@ -138,102 +306,13 @@ def main():
         parsed_args.calendar = parsed_args.defaultCalendar
 
     cal_names = parse_cal_names(parsed_args.calendar)
+    from .gcal import GoogleCalendarInterface
     gcal = GoogleCalendarInterface(
-            cal_names=cal_names, printer=printer, **vars(parsed_args)
+            cal_names=cal_names, printer=printer, args=parsed_args
     )
 
     try:
-        if parsed_args.command == 'list':
-            gcal.ListAllCalendars()
-
-        elif parsed_args.command == 'agenda':
-            gcal.AgendaQuery(start=parsed_args.start, end=parsed_args.end)
-
-        elif parsed_args.command == 'agendaupdate':
-            gcal.AgendaUpdate(parsed_args.file)
-
-        elif parsed_args.command == 'updates':
-            gcal.UpdatesQuery(
-                    last_updated_datetime=parsed_args.since,
-                    start=parsed_args.start,
-                    end=parsed_args.end)
-
-        elif parsed_args.command == 'conflicts':
-            gcal.ConflictsQuery(
-                    search_text=parsed_args.text,
-                    start=parsed_args.start,
-                    end=parsed_args.end)
-
-        elif parsed_args.command == 'calw':
-            gcal.CalQuery(
-                    parsed_args.command, count=parsed_args.weeks,
-                    start_text=parsed_args.start
-            )
-
-        elif parsed_args.command == 'calm':
-            gcal.CalQuery(parsed_args.command, start_text=parsed_args.start)
-
-        elif parsed_args.command == 'quick':
-            if not parsed_args.text:
-                printer.err_msg('Error: invalid event text\n')
-                sys.exit(1)
-
-            # allow unicode strings for input
-            gcal.QuickAddEvent(
-                    parsed_args.text, reminders=parsed_args.reminders
-            )
-
-        elif parsed_args.command == 'add':
-            if parsed_args.prompt:
-                run_add_prompt(parsed_args, printer)
-
-            # calculate "when" time:
-            try:
-                estart, eend = utils.get_times_from_duration(
-                        parsed_args.when, parsed_args.duration,
-                        parsed_args.allday
-                )
-            except ValueError as exc:
-                printer.err_msg(str(exc))
-                # Since we actually need a valid start and end time in order to
-                # add the event, we cannot proceed.
-                raise
-
-            gcal.AddEvent(parsed_args.title, parsed_args.where, estart, eend,
-                          parsed_args.description, parsed_args.who,
-                          parsed_args.reminders, parsed_args.event_color)
-
-        elif parsed_args.command == 'search':
-            gcal.TextQuery(
-                    parsed_args.text[0], start=parsed_args.start,
-                    end=parsed_args.end
-            )
-
-        elif parsed_args.command == 'delete':
-            gcal.ModifyEvents(
-                    gcal._delete_event, parsed_args.text[0],
-                    start=parsed_args.start, end=parsed_args.end,
-                    expert=parsed_args.iamaexpert
-            )
-
-        elif parsed_args.command == 'edit':
-            gcal.ModifyEvents(
-                    gcal._edit_event, parsed_args.text[0],
-                    start=parsed_args.start, end=parsed_args.end
-            )
-
-        elif parsed_args.command == 'remind':
-            gcal.Remind(
-                    parsed_args.minutes, parsed_args.cmd,
-                    use_reminders=parsed_args.use_reminders
-            )
-
-        elif parsed_args.command == 'import':
-            gcal.ImportICS(
-                    parsed_args.verbose, parsed_args.dump,
-                    parsed_args.reminders, parsed_args.file
-            )
-
+        COMMAND_HANDLERS[parsed_args.command](parsed_args, gcal, printer)
     except GcalcliError as exc:
         printer.err_msg(str(exc))
         sys.exit(1)
@@ -244,8 +323,5 @@ def SIGINT_handler(signum, frame):
     sys.exit(1)
 
 
-signal.signal(signal.SIGINT, SIGINT_handler)
-
-
 if __name__ == '__main__':
     main()
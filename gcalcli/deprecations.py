@@ -7,6 +7,9 @@ from .printer import Printer, valid_color_name
 
 printer = Printer()
 
+# set on a namespace once any deprecated option has been parsed into it
+USED_DEPRECATED_OPT = '_used_deprecated_opt'
+
 CAMELS = {"--configFolder": "--config-folder",
           "--defaultCalendar": "--default-calendar"}
 
@@ -23,10 +26,17 @@ def warn_deprecated_opt(option_string):
     printer.err_msg(msg.format(option_string))
 
 
+def _use_deprecated_opt(namespace, option_string):
+    warn_deprecated_opt(option_string)
+    # keeps the namespace out of the argument cache, so the warning is shown
+    # on every run rather than only when the arguments get parsed
+    setattr(namespace, USED_DEPRECATED_OPT, True)
+
+
 class DeprecatedStore(argparse._StoreAction):
     def __call__(
             self, parser, namespace, values, option_string=None, **kwargs):
-        warn_deprecated_opt(option_string)
+        _use_deprecated_opt(namespace, option_string)
         setattr(namespace, self.dest, values)
 
 
@@ -47,13 +57,13 @@ class DeprecatedStoreTrue(argparse._StoreConstAction):
             help=help)
 
     def __call__(self, parser, namespace, values, option_string=None):
-        warn_deprecated_opt(option_string)
+        _use_deprecated_opt(namespace, option_string)
         setattr(namespace, self.dest, self.const)
 
 
 class DeprecatedAppend(argparse._AppendAction):
     def __call__(self, parser, namespace, values, option_string=None):
-        warn_deprecated_opt(option_string)
+        _use_deprecated_opt(namespace, option_string)
         items = argparse._copy.copy(
                 argparse._ensure_value(namespace, self.dest, []))
         items.append(values)
@@ -97,7 +107,7 @@ def parser_allow_deprecated(getter_func=None, name=None):
     if callable(getter_func):
         @functools.wraps(getter_func)
         def wrapped(*args, **kwargs):
-            parser = getter_func()
+            parser = getter_func(*args, **kwargs)
             for arg, options in OPTIONS[name].items():
                 parser.add_argument(
                         arg, default=options['default'], **BASE_OPTS[name])
@@ -1,14 +1,19 @@
-from collections import namedtuple
+from bisect import bisect_left
 from csv import DictReader, excel_tab
-from datetime import date, datetime, timedelta
-from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache, partial
+from itertools import accumulate, chain
 import json
+import mmap
 import os
+import pickle
 import random
 import re
 import shlex
 import sys
 import textwrap
+import threading
 import time
 from typing import List
 from unicodedata import east_asian_width
@@ -36,38 +41,120 @@ from .validators import (get_input, get_override_color_id, PARSABLE_DATE,
                          STR_NOT_EMPTY, STR_TO_INT, VALID_COLORS)
 
 try:
-    import cPickle as pickle
-except Exception:
-    import pickle
+    import orjson
+except ImportError:
+    orjson = None
 
 
-EventTitle = namedtuple('EventTitle', ['title', 'color'])
+class EventTitle:
+    """Title of an event in a calendar cell, trimmed as it gets printed"""
+
+    __slots__ = ('title', 'color')
+
+    def __init__(self, title, color):
+        self.title = title
+        self.color = color
+
 
 CONFERENCE_DATA_VERSION = 1
+# bump when the layout of the cache changes to invalidate existing caches
+CACHE_SCHEMA_VERSION = 2
+# seconds before the cached calendar list is revalidated
+CACHE_TTL = 3600
+# seconds before a stalled connection to the API is given up on
+HTTP_TIMEOUT = 30
+CAL_LIST_PAGE_SIZE = 250
+# smaller caches are read faster than they are mapped
+MMAP_MIN_SIZE = 64 * 1024
+# calendars queried concurrently
+MAX_WORKERS = 8
 PRINTER = Printer()
+UNIWIDTH = {'W': 2, 'F': 2, 'N': 1, 'Na': 1, 'H': 1, 'A': 1}
+# reconfigured for each description rather than built anew, not thread safe
+DESCR_WRAPPER = textwrap.TextWrapper()
+
+
+@lru_cache(maxsize=4096)
+def _printed_len(string):
+    """Return the number of terminal columns string takes up."""
+    return sum(UNIWIDTH[east_asian_width(char)] for char in string)
+
+
+def _pad(string, width, print_len=None):
+    """Pad string with spaces to take up width terminal columns."""
+    if print_len is None:
+        print_len = _printed_len(string)
+    # ljust counts characters, not columns, so pad by the missing columns
+    return string.ljust(len(string) + width - print_len)
+
+
+def _load_pickle(file):
+    """Unpickle file, mapping it into memory instead of reading it if large."""
+    if os.fstat(file.fileno()).st_size < MMAP_MIN_SIZE:
+        return pickle.load(file)
+    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return pickle.loads(mapped)
+
+
+def _print_events_json(event_list):
+    """Print events as JSON, dropping the datetimes gcalcli adds to them."""
+    for event in event_list:
+        event.pop('s', None)
+        event.pop('e', None)
+    _print_json(event_list)
+
+
+def _parse_iso(time):
+    """Parse an RFC 3339 time or date as returned by the API."""
+    try:
+        # much faster than dateutil, but before 3.11 it does not take a Z
+        return datetime.fromisoformat(time.replace('Z', '+00:00'))
+    except ValueError:
+        return parse(time)
+
+
+def _print_json(obj):
+    """Print obj as JSON, using the faster orjson serializer if available."""
+    if orjson is not None:
+        sys.stdout.write(orjson.dumps(obj).decode())
+        sys.stdout.write('\n')
+    else:
+        # streamed rather than built as one string first
+        json.dump(obj, sys.stdout)
+        sys.stdout.write('\n')
 
 
 class GoogleCalendarInterface:
 
     cache: Cache = {}
     all_cals: List[CalendarListEntry] = []
-    now = datetime.now(tzlocal())
     agenda_length = 5
     conflicts_lookahead_days = 30
     max_retries = 5
+    # Google recommends at most 50 calls per batch request
+    batch_size = 50
     auth_http = None
+    credentials = None
     cal_service = None
+    pending_deletes = None
 
     ACCESS_OWNER = 'owner'
     ACCESS_WRITER = 'writer'
     ACCESS_READER = 'reader'
     ACCESS_FREEBUSY = 'freeBusyReader'
 
-    UNIWIDTH = {'W': 2, 'F': 2, 'N': 1, 'Na': 1, 'H': 1, 'A': 1}
+    UNIWIDTH = UNIWIDTH
 
-    def __init__(self, cal_names=(), printer=PRINTER, **options):
+    def __init__(self, cal_names=(), printer=PRINTER, args=None, **options):
         self.cals = []
         self.printer = printer
+        self._tzlocal = tzlocal()
+        self._thread_local = threading.local()
+        if args is not None:
+            # share the parsed namespace's dict instead of copying it
+            args_options = vars(args)
+            args_options.update(options)
+            options = args_options
         self.options = options
 
         self.details = options.get('details', {})
@@ -87,11 +174,13 @@ class GoogleCalendarInterface:
 
         for cal_name in selected_names:
             matches = []
+            pattern = re.compile(cal_name.name, flags=re.I)
             for self_cal in self.all_cals:
+                summary = self_cal['summary']
                 # For exact match, we should match only 1 entry and accept
                 # the first entry.  Should honor access role order since
                 # it happens after _get_cached()
-                if cal_name.name == self_cal['summary']:
+                if cal_name.name == summary:
                     # This makes sure that if we have any regex matches
                     # that we toss them out in favor of the specific match
                     matches = [self_cal]
@@ -99,13 +188,18 @@ class GoogleCalendarInterface:
                     break
                 # Otherwise, if the calendar matches as a regex, append
                 # it to the list of potential matches
-                elif re.search(cal_name.name, self_cal['summary'], flags=re.I):
+                elif pattern.search(summary):
                     matches.append(self_cal)
                     self_cal['colorSpec'] = cal_name.color
             # Add relevant matches to the list of calendars we want to
             # operate against
             self.cals += matches
 
+    @property
+    def now(self):
+        # evaluated on every access, snapshot it into a local in loops
+        return datetime.now(self._tzlocal)
+
     @staticmethod
     def _localize_datetime(dt):
         if not hasattr(dt, 'tzinfo'):  # Why are we skipping these?
@@ -116,21 +210,69 @@ class GoogleCalendarInterface:
             return dt.astimezone(tzlocal())
 
     def _retry_with_backoff(self, method):
+        # httplib2 connections can't be shared between threads, so worker
+        # threads execute requests on a connection of their own
+        http = getattr(self._thread_local, 'http', None)
         for n in range(self.max_retries):
             try:
-                return method.execute()
+                if http is None:
+                    return method.execute()
+                return method.execute(http=http)
             except HttpError as e:
-                error = json.loads(e.content)
-                error = error.get('error')
-                if error.get('code') == '403' and \
-                        error.get('errors')[0].get('reason') \
-                        in ['rateLimitExceeded', 'userRateLimitExceeded']:
-                    time.sleep((2 ** n) + random.random())
+                if e.resp.status == 304:
+                    # not modified, there is no error body to look at
+                    raise
+                if self._rate_limited(e):
+                    retry_after = e.resp.get('retry-after', '')
+                    if retry_after.isdigit():
+                        time.sleep(int(retry_after))
+                    else:
+                        time.sleep((2 ** n) + random.random())
                 else:
                     raise
 
         return None
 
+    @staticmethod
+    def _rate_limited(e):
+        if e.resp.status != 403:
+            return False
+        error = json.loads(e.content)
+        error = error.get('error')
+        return error.get('errors')[0].get('reason') \
+            in ['rateLimitExceeded', 'userRateLimitExceeded']
+
+    def _execute_batch(self, requests):
+        """Execute (request, callback) pairs as batch requests.
+
+        Each callback is called with the response and exception (if any) of
+        its own request once the batch containing it has been executed.
+        Requests rate limited within a batch are retried on their own.
+        """
+        for i in range(0, len(requests), self.batch_size):
+            rate_limited = []
+
+            def done(request_id, response, exception, request, callback):
+                if isinstance(exception, HttpError) and \
+                        self._rate_limited(exception):
+                    rate_limited.append((request, callback))
+                else:
+                    callback(response, exception)
+
+            batch = self.get_cal_service().new_batch_http_request()
+            for request, callback in requests[i:i + self.batch_size]:
+                batch.add(request, callback=partial(
+                        done, request=request, callback=callback))
+            self._retry_with_backoff(batch)
+
+            for request, callback in rate_limited:
+                try:
+                    response = self._retry_with_backoff(request)
+                except HttpError as e:
+                    callback(None, e)
+                else:
+                    callback(response, None)
+
     def _google_auth(self):
         from argparse import Namespace
         if not self.auth_http:
@@ -156,10 +298,16 @@ class GoogleCalendarInterface:
                     Namespace(**self.options)
                 )
 
-            self.auth_http = credentials.authorize(httplib2.Http())
+            # a single persistent connection is kept alive and shared by
+            # every request, batches included
+            self.credentials = credentials
+            self.auth_http = self._new_auth_http()
 
         return self.auth_http
 
+    def _new_auth_http(self):
+        return self.credentials.authorize(httplib2.Http(timeout=HTTP_TIMEOUT))
+
     def get_cal_service(self):
         if not self.cal_service:
             self.cal_service = build(serviceName='calendar',
@@ -171,6 +319,26 @@ class GoogleCalendarInterface:
     def get_events(self):
         return self.get_cal_service().events()
 
+    def get_events_batch(self, queries):
+        """List events of several calendars in batch requests.
+
+        queries holds (cal_id, params) pairs for events().list; a list of
+        (response, exception) pairs in the same order is returned.
+        """
+        results = [(None, None)] * len(queries)
+
+        def collect(i):
+            def callback(response, exception):
+                results[i] = (response, exception)
+            return callback
+
+        events = self.get_events()
+        self._execute_batch([
+            (events.list(calendarId=cal_id, **params), collect(i))
+            for i, (cal_id, params) in enumerate(queries)
+        ])
+        return results
+
     def _get_cached(self):
         if self.options['config_folder']:
             cache_file = os.path.expanduser(
@@ -188,24 +356,44 @@ class GoogleCalendarInterface:
 
         self.cache = {}
         self.all_cals = []
+        etag = None
 
         if self.options['use_cache']:
             # note that we need to use pickle for cache data since we stuff
             # various non-JSON data in the runtime storage structures
             try:
                 with open(cache_file, 'rb') as _cache_:
-                    self.cache = pickle.load(_cache_)
-                    self.all_cals = self.cache['all_cals']
+                    self.cache = _load_pickle(_cache_)
                 # XXX assuming data is valid, need some verification check here
-                return
+                if self.cache.get('version') == CACHE_SCHEMA_VERSION:
+                    self.all_cals = self.cache['all_cals']
+                    ttl = self.options.get('cache_ttl', CACHE_TTL)
+                    if time.time() - self.cache.get('mtime', 0) <= ttl:
+                        return
+                    # stale, revalidate it against the calendar list's etag
+                    etag = self.cache.get('etag')
+                else:
+                    self.cache = {}
             except IOError:
                 pass
                 # fall through
 
-        cal_list = self._retry_with_backoff(
-            self.get_cal_service().calendarList().list()
-        )
+        # the API maximum, which fits most users' calendars in one page
+        request = self.get_cal_service().calendarList().list(
+                maxResults=CAL_LIST_PAGE_SIZE)
+        if etag:
+            request.headers['If-None-Match'] = etag
+        try:
+            cal_list = self._retry_with_backoff(request)
+        except HttpError as e:
+            if e.resp.status != 304:
+                raise
+            # unchanged since it was cached, only renew its timestamp
+            self._write_cache(cache_file)
+            return
 
+        self.all_cals = []
+        self.cache['etag'] = cal_list.get('etag')
         while True:
             for cal in cal_list['items']:
                 self.all_cals.append(cal)
@@ -213,7 +401,7 @@ class GoogleCalendarInterface:
             if page_token:
                 cal_list = self._retry_with_backoff(
                     self.get_cal_service().calendarList().list(
-                        pageToken=page_token
+                        maxResults=CAL_LIST_PAGE_SIZE, pageToken=page_token
                     )
                 )
             else:
@@ -223,8 +411,13 @@ class GoogleCalendarInterface:
 
         if self.options['use_cache']:
             self.cache['all_cals'] = self.all_cals
-            with open(cache_file, 'wb') as _cache_:
-                pickle.dump(self.cache, _cache_)
+            self._write_cache(cache_file)
+
+    def _write_cache(self, cache_file):
+        self.cache['version'] = CACHE_SCHEMA_VERSION
+        self.cache['mtime'] = time.time()
+        with open(cache_file, 'wb') as _cache_:
+            pickle.dump(self.cache, _cache_, pickle.HIGHEST_PROTOCOL)
 
     def _calendar_color(self, event, override_color=False):
         ansi_codes = {
@@ -298,13 +491,17 @@ class GoogleCalendarInterface:
     def _get_week_events(self, start_dt, end_dt, event_list):
         week_events = [[] for _ in range(7)]
 
+        now = self.now
+        cal_width = self.options['cal_width']
+        color_now = self.options['color_now_marker']
+        override_color = self.options['override_color']
         now_in_week = True
         now_marker_printed = False
-        if self.now < start_dt or self.now > end_dt:
+        if now < start_dt or now > end_dt:
             now_in_week = False
 
         for event in event_list:
-            event_daynum = self._cal_monday(int(event['s'].strftime('%w')))
+            event_daynum = self._cal_monday(event['s'].isoweekday() % 7)
             event_allday = is_all_day(event)
 
             event_end_date = event['e']
@@ -330,12 +527,12 @@ class GoogleCalendarInterface:
                 color_as_now_marker = False
 
                 if now_in_week and not now_marker_printed:
-                    if (days_since_epoch(self.now) <
+                    if (days_since_epoch(now) <
                             days_since_epoch(event['s'])):
                         week_events[event_daynum].append(
                                 EventTitle(
-                                    '\n' + self.options['cal_width'] * '-',
-                                    self.options['color_now_marker']
+                                    '\n' + cal_width * '-',
+                                    color_now
                                 )
                         )
                         now_marker_printed = True
@@ -345,17 +542,17 @@ class GoogleCalendarInterface:
                     # into the wrong day.  This resolves the issue by skipping
                     # all day events for specific coloring but not for previous
                     # or next events
-                    elif self.now >= event['s'] and \
-                            self.now <= event_end_date and \
+                    elif now >= event['s'] and \
+                            now <= event_end_date and \
                             not event_allday:
                         # line marker is during the event (recolor event)
                         color_as_now_marker = True
                         now_marker_printed = True
 
                 if color_as_now_marker:
-                    event_color = self.options['color_now_marker']
+                    event_color = color_now
                 else:
-                    if self.options['override_color'] and event.get('colorId'):
+                    if override_color and event.get('colorId'):
                         event_color = self._calendar_color(
                                 event, override_color=True
                         )
@@ -369,10 +566,8 @@ class GoogleCalendarInterface:
                     if event_end_date > end_dt:
                         end_daynum = 6
                     else:
-                        end_daynum = \
-                            self._cal_monday(
-                                    int(event_end_date.strftime('%w'))
-                            )
+                        end_daynum = self._cal_monday(
+                                event_end_date.isoweekday() % 7)
                     if event_daynum > end_daynum:
                         event_daynum = 0
                     for day in range(event_daynum, end_daynum + 1):
@@ -391,27 +586,28 @@ class GoogleCalendarInterface:
         # We need to treat everything as unicode for this to actually give
         # us the info we want.  Date string were coming in as `str` type
         # so we convert them to unicode and then check their size. Fixes
-        # the output issues we were seeing around non-US locale strings
-        return sum(
-                self.UNIWIDTH[east_asian_width(char)] for char in string
-        )
+        # the output issues we were seeing around non-US locale strings.
+        # Titles, words and day names repeat a lot, so the lengths are cached
+        return _printed_len(string)
 
     def _word_cut(self, word):
-        stop = 0
-        for i, char in enumerate(word):
-            stop += self._printed_len(char)
-            if stop >= self.options['cal_width']:
-                return stop, i + 1
+        # printed width of each prefix of word, the cut goes after the first
+        # one to reach cal_width
+        stops = list(accumulate(UNIWIDTH[east_asian_width(char)]
+                                for char in word))
+        i = bisect_left(stops, self.options['cal_width'])
+        if i < len(stops):
+            return stops[i], i + 1
 
     def _next_cut(self, string):
+        cal_width = self.options['cal_width']
         print_len = 0
 
         words = string.split()
-        word_lens = []
         for i, word in enumerate(words):
-            word_lens.append(self._printed_len(word))
+            word_len = self._printed_len(word)
 
-            if (word_lens[-1] + print_len) >= self.options['cal_width']:
+            if (word_len + print_len) >= cal_width:
                 # this many words is too many, try to cut at the prev word
                 cut_idx = len(' '.join(words[:i]))
 
@@ -420,20 +616,22 @@ class GoogleCalendarInterface:
                     return self._word_cut(word)
 
                 return (print_len, cut_idx)
-            print_len = sum(word_lens) + i  # +i for the space between words
+            # running total, +1 for the space before every word but the first
+            print_len += word_len + (1 if i else 0)
 
         return (print_len, len(' '.join(words[:i])))
 
     def _get_cut_index(self, event_string):
+        cal_width = self.options['cal_width']
         print_len = self._printed_len(event_string)
 
         # newline in string is a special case
         idx = event_string.find('\n')
-        if idx > -1 and idx <= self.options['cal_width']:
+        if idx > -1 and idx <= cal_width:
             return (self._printed_len(event_string[:idx]),
                     len(event_string[:idx]))
 
-        if print_len <= self.options['cal_width']:
+        if print_len <= cal_width:
             return (print_len, len(event_string))
 
         else:
@@ -441,15 +639,25 @@ class GoogleCalendarInterface:
             return self._next_cut(event_string)
 
     def _GraphEvents(self, cmd, start_datetime, count, event_list):
-        # ignore started events (i.e. events that start previous day and end
-        # start day)
-
+        cal_width = self.options['cal_width']
         color_border = self.options['color_border']
+        color_date = self.options['color_date']
+        color_now = self.options['color_now_marker']
 
-        while (len(event_list) and event_list[0]['s'] < start_datetime):
-            event_list = event_list[1:]
-
-        day_width_line = self.options['cal_width'] * self.printer.art['hrz']
+        # ignore started events (i.e. events that start previous day and end
+        # start day); event_list is sorted by start, so bisect past them
+        starts = [event['s'] for event in event_list]
+        first = bisect_left(starts, start_datetime)
+        event_list = event_list[first:]
+        starts = starts[first:]
+
+        # each week only needs to look at the events starting in it, plus
+        # the all day events that started earlier but may still be running
+        max_allday_span = max((event['e'] - event['s']
+                               for event in event_list if is_all_day(event)),
+                              default=timedelta(0))
+
+        day_width_line = cal_width * self.printer.art['hrz']
         days = 7 if self.options['cal_weekend'] else 5
         # Get the localized day names... January 1, 2001 was a Monday
         day_names = [date(2001, 1, i + 1).strftime('%A') for i in range(days)]
@@ -466,7 +674,7 @@ class GoogleCalendarInterface:
         week_top = build_divider('ulc', 'ute', 'urc')
         week_divider = build_divider('lte', 'crs', 'rte')
         week_bottom = build_divider('llc', 'bte', 'lrc')
-        empty_day = self.options['cal_width'] * ' '
+        empty_day = cal_width * ' '
 
         if cmd == 'calm':
             # month titlebar
@@ -474,11 +682,11 @@ class GoogleCalendarInterface:
             self.printer.msg(month_title_top + '\n', color_border)
 
             month_title = start_datetime.strftime('%B %Y')
-            month_width = (self.options['cal_width'] * days) + (days - 1)
-            month_title += ' ' * (month_width - self._printed_len(month_title))
+            month_width = (cal_width * days) + (days - 1)
+            month_title = _pad(month_title, month_width)
 
             self.printer.art_msg('vrt', color_border)
-            self.printer.msg(month_title, self.options['color_date'])
+            self.printer.msg(month_title, color_date)
             self.printer.art_msg('vrt', color_border)
 
             month_title_bottom = build_divider('lte', 'ute', 'rte')
@@ -491,53 +699,55 @@ class GoogleCalendarInterface:
         # weekday labels
         self.printer.art_msg('vrt', color_border)
         for day_name in day_names:
-            day_name += ' ' * (
-                    self.options['cal_width'] - self._printed_len(day_name)
-            )
-            self.printer.msg(day_name, self.options['color_date'])
+            day_name = _pad(day_name, cal_width)
+            self.printer.msg(day_name, color_date)
             self.printer.art_msg('vrt', color_border)
 
         self.printer.msg('\n' + week_divider + '\n', color_border)
-        cur_month = start_datetime.strftime('%b')
+        cur_month = start_datetime.month
+        today = self.now.date()
 
         # get date range objects for the first week
         if cmd == 'calm':
-            day_num = self._cal_monday(int(start_datetime.strftime('%w')))
+            day_num = self._cal_monday(start_datetime.isoweekday() % 7)
             start_datetime = (start_datetime - timedelta(days=day_num))
         start_week_datetime = start_datetime
         end_week_datetime = (start_week_datetime + timedelta(days=7))
 
         for i in range(count):
             # create and print the date line for a week
+            vrt = (self.printer.art['vrt'], color_border)
+            line = []
             for j in range(days):
+                day = start_week_datetime + timedelta(days=j)
                 if cmd == 'calw':
-                    d = (start_week_datetime +
-                         timedelta(days=j)).strftime('%d %b')
-                else:  # (cmd == 'calm'):
-                    d = (start_week_datetime +
-                         timedelta(days=j)).strftime('%d')
-                    if cur_month != (start_week_datetime +
-                                     timedelta(days=j)).strftime('%b'):
-                        d = ''
-                tmp_date_color = self.options['color_date']
-
-                fmt_now = (start_week_datetime +
-                           timedelta(days=j)).strftime('%d%b%Y')
-                if self.now.strftime('%d%b%Y') == fmt_now:
-                    tmp_date_color = self.options['color_now_marker']
+                    d = day.strftime('%d %b')
+                elif cur_month == day.month:  # (cmd == 'calm'):
+                    d = day.strftime('%d')
+                else:
+                    d = ''
+                tmp_date_color = color_date
+
+                if day.date() == today:
+                    tmp_date_color = color_now
                     d += ' **'
 
-                d += ' ' * (self.options['cal_width'] - self._printed_len(d))
+                d = _pad(d, cal_width)
 
                 # print dates
-                self.printer.art_msg('vrt', color_border)
-                self.printer.msg(d, tmp_date_color)
+                line.append(vrt)
+                line.append((d, tmp_date_color))
 
-            self.printer.art_msg('vrt', color_border)
-            self.printer.msg('\n')
+            line.append(vrt)
+            line.append(('\n', 'default'))
+            self.printer.msg_many(line)
 
+            week_start = bisect_left(
+                    starts, start_week_datetime - max_allday_span)
+            week_end = bisect_left(starts, end_week_datetime)
             week_events = self._get_week_events(
-                    start_week_datetime, end_week_datetime, event_list
+                    start_week_datetime, end_week_datetime,
+                    event_list[week_start:week_end]
             )
 
             # get date range objects for the next week
@@ -548,23 +758,23 @@ class GoogleCalendarInterface:
                 # keep looping over events by day, printing one line at a time
                 # stop when everything has been printed
                 done = True
-                self.printer.art_msg('vrt', color_border)
+                line = [vrt]
                 for j in range(days):
                     if not week_events[j]:
                         # no events today
-                        self.printer.msg(
-                                empty_day + self.printer.art['vrt'],
-                                color_border
+                        line.append(
+                                (empty_day + self.printer.art['vrt'],
+                                 color_border)
                         )
                         continue
 
                     curr_event = week_events[j][0]
                     print_len, cut_idx = self._get_cut_index(curr_event.title)
-                    padding = ' ' * (self.options['cal_width'] - print_len)
 
-                    self.printer.msg(
-                            curr_event.title[:cut_idx] + padding,
-                            curr_event.color
+                    line.append(
+                            (_pad(curr_event.title[:cut_idx], cal_width,
+                                  print_len),
+                             curr_event.color)
                     )
 
                     # trim what we've already printed
@@ -573,13 +783,13 @@ class GoogleCalendarInterface:
                     if trimmed_title == '':
                         week_events[j].pop(0)
                     else:
-                        week_events[j][0] = \
-                                curr_event._replace(title=trimmed_title)
+                        curr_event.title = trimmed_title
 
                     done = False
-                    self.printer.art_msg('vrt', color_border)
+                    line.append(vrt)
 
-                self.printer.msg('\n')
+                line.append(('\n', 'default'))
+                self.printer.msg_many(line)
                 if done:
                     break
 
@@ -598,12 +808,18 @@ class GoogleCalendarInterface:
 
         header_row = chain.from_iterable(handler.fieldnames
                                          for handler in handlers)
-        print(*header_row, sep='\t')
+        # collected and written at once rather than printed line by line
+        lines = ['\t'.join(header_row)]
+
+        if self.options['ignore_started']:
+            # event_list is sorted by start, so bisect past started events
+            starts = [event['s'] for event in event_list]
+            event_list = event_list[bisect_left(starts, self.now):]
 
+        ignore_declined = self.options['ignore_declined']
+        declined = self._DeclinedEvent
         for event in event_list:
-            if self.options['ignore_started'] and (event['s'] < self.now):
-                continue
-            if self.options['ignore_declined'] and self._DeclinedEvent(event):
+            if ignore_declined and declined(event):
                 continue
 
             row = []
@@ -611,36 +827,39 @@ class GoogleCalendarInterface:
                 row.extend(handler.get(event))
 
             output = ('\t'.join(row)).replace('\n', r'\n')
-            print(output)
+            lines.append(output)
+
+        lines.append('')
+        sys.stdout.write('\n'.join(lines))
 
     def _PrintEvent(self, event, prefix):
 
         def _format_descr(descr, indent, box):
-            wrapper = textwrap.TextWrapper()
+            width = self.details.get('width')
+            wrapper = DESCR_WRAPPER
             if box:
                 wrapper.initial_indent = (indent + '  ')
                 wrapper.subsequent_indent = (indent + '  ')
-                wrapper.width = (self.details.get('width') - 2)
+                wrapper.width = (width - 2)
             else:
                 wrapper.initial_indent = indent
                 wrapper.subsequent_indent = indent
-                wrapper.width = self.details.get('width')
-            new_descr = ''
+                wrapper.width = width
+            indent_len = len(indent)
+            vrt = self.printer.art['vrt']
+            new_descr = []
             for line in descr.split('\n'):
                 if box:
                     tmp_line = wrapper.fill(line)
                     for single_line in tmp_line.split('\n'):
-                        single_line = single_line.ljust(
-                                self.details.get('width'), ' '
-                        )
-                        new_descr += single_line[:len(indent)] + \
-                            self.printer.art['vrt'] + \
-                            single_line[(len(indent) + 1):
-                                        (self.details.get('width') - 1)] + \
-                            self.printer.art['vrt'] + '\n'
+                        single_line = single_line.ljust(width, ' ')
+                        new_descr.append(
+                                single_line[:indent_len] + vrt +
+                                single_line[(indent_len + 1):(width - 1)] +
+                                vrt)
                 else:
-                    new_descr += wrapper.fill(line) + '\n'
-            return new_descr.rstrip()
+                    new_descr.append(wrapper.fill(line))
+            return '\n'.join(new_descr).rstrip()
 
         indent = 10 * ' '
         details_indent = 19 * ' '
@@ -769,58 +988,34 @@ class GoogleCalendarInterface:
                            (details_indent, rem['method'], rem['minutes'])
                     self.printer.msg(xstr, 'default')
 
-        if self.details.get('email') \
-                and 'email' in event['creator'] \
-                and event['creator']['email'].strip():
-            xstr = '%s  Email: %s\n' % (
-                details_indent,
-                event['creator']['email'].strip()
-            )
+        email = self.details.get('email') and \
+            event['creator'].get('email', '').strip()
+        if email:
+            xstr = '%s  Email: %s\n' % (details_indent, email)
             self.printer.msg(xstr, 'default')
 
-        if self.details.get('description') \
-                and 'description' in event \
-                and event['description'].strip():
+        descr = self.details.get('description') and \
+            event.get('description', '').strip()
+        if descr:
             descr_indent = details_indent + '  '
             box = True  # leave old non-box code for option later
+            art = self.printer.art
             if box:
-                top_marker = (
-                        descr_indent +
-                        self.printer.art['ulc'] +
-                        (self.printer.art['hrz'] *
-                            ((self.details.get('width') - len(descr_indent))
-                             - 2
-                             )
-                         ) +
-                        self.printer.art['urc']
-                )
-                bot_marker = (
-                        descr_indent +
-                        self.printer.art['llc'] +
-                        (self.printer.art['hrz'] *
-                            ((self.details.get('width') - len(descr_indent))
-                             - 2
-                             )
-                         ) +
-                        self.printer.art['lrc']
-                )
-                xstr = '%s  Description:\n%s\n%s\n%s\n' % (
-                    details_indent,
-                    top_marker,
-                    _format_descr(event['description'].strip(),
-                                  descr_indent, box),
-                    bot_marker
-                )
+                hrz_run = art['hrz'] * (
+                        (self.details.get('width') - len(descr_indent)) - 2)
+                top_marker = ''.join(
+                        [descr_indent, art['ulc'], hrz_run, art['urc']])
+                bot_marker = ''.join(
+                        [descr_indent, art['llc'], hrz_run, art['lrc']])
             else:
-                marker = descr_indent + '-' * \
+                top_marker = bot_marker = descr_indent + '-' * \
                     (self.details.get('width') - len(descr_indent))
-                xstr = '%s  Description:\n%s\n%s\n%s\n' % (
-                    details_indent,
-                    marker,
-                    _format_descr(event['description'].strip(),
-                                  descr_indent, box),
-                    marker
-                )
+            xstr = ''.join([
+                details_indent, '  Description:\n',
+                top_marker, '\n',
+                _format_descr(descr, descr_indent, box),
+                '\n', bot_marker, '\n'
+            ])
             self.printer.msg(xstr, 'default')
 
     def delete(self, cal_id, event_id):
@@ -835,6 +1030,10 @@ class GoogleCalendarInterface:
         event_id = event['id']
 
         if self.expert:
+            if self.pending_deletes is not None:
+                # deleted in batches once all events have been listed
+                self.pending_deletes.append((cal_id, event_id))
+                return
             self.delete(cal_id, event_id)
             self.printer.msg('Deleted!\n', 'red')
             return
@@ -858,9 +1057,22 @@ class GoogleCalendarInterface:
             sys.stdout.write('\n')
             sys.exit(1)
 
+    def _delete_batch(self, ids):
+        def deleted(response, exception):
+            if exception:
+                self.printer.err_msg('Error: %s\n' % exception)
+            else:
+                self.printer.msg('Deleted!\n', 'red')
+
+        events = self.get_events()
+        self._execute_batch([
+            (events.delete(calendarId=cal_id, eventId=event_id), deleted)
+            for cal_id, event_id in ids
+        ])
+
     def _SetEventStartEnd(self, start, end, event):
-        event['s'] = parse(start)
-        event['e'] - parse(end)
+        event['s'] = self._localize_datetime(_parse_iso(start))
+        event['e'] = self._localize_datetime(_parse_iso(end))
 
         if self.options.get('allday'):
             event['start'] = {'date': start,
@@ -870,12 +1082,13 @@ class GoogleCalendarInterface:
                             'dateTime': None,
                             'timeZone': None}
         else:
+            time_zone = event['gcalcli_cal']['timeZone']
             event['start'] = {'date': None,
                               'dateTime': start,
-                              'timeZone': event['gcalcli_cal']['timeZone']}
+                              'timeZone': time_zone}
             event['end'] = {'date': None,
                             'dateTime': end,
-                            'timeZone': event['gcalcli_cal']['timeZone']}
+                            'timeZone': time_zone}
         return event
 
     def _edit_event(self, event):
@@ -1009,20 +1222,32 @@ class GoogleCalendarInterface:
         # 10 chars for day and length must match 'indent' in _PrintEvent
         day_format = '\n%Y-%m-%d' if year_date else '\n%a %b %d'
         day = ''
+        # events share days, so format each day only once
+        day_strs = {}
+
+        if self.options['ignore_started']:
+            # event_list is sorted by start, so bisect past started events
+            starts = [event['s'] for event in event_list]
+            event_list = event_list[bisect_left(starts, self.now):]
 
+        ignore_declined = self.options['ignore_declined']
+        declined = self._DeclinedEvent
+        print_event = self._PrintEvent
         for event in event_list:
-            if self.options['ignore_started'] and (event['s'] < self.now):
-                continue
-            if self.options['ignore_declined'] and self._DeclinedEvent(event):
+            if ignore_declined and declined(event):
                 continue
 
             selected += 1
-            tmp_day_str = event['s'].strftime(day_format)
+            day_key = event['s'].toordinal()
+            tmp_day_str = day_strs.get(day_key)
+            if tmp_day_str is None:
+                tmp_day_str = day_strs[day_key] = \
+                    event['s'].strftime(day_format)
             prefix = None
             if year_date or tmp_day_str != day:
                 day = prefix = tmp_day_str
 
-            self._PrintEvent(event, prefix)
+            print_event(event, prefix)
 
             if work:
                 work(event)
@@ -1032,38 +1257,41 @@ class GoogleCalendarInterface:
     def _GetAllEvents(self, cal, events, end):
 
         event_list = []
+        # events tend to share start and end times, parse each one once
+        times = {}
+
+        def parse_time(time):
+            dt = times.get(time)
+            if dt is None:
+                dt = times[time] = self._localize_datetime(_parse_iso(time))
+            return dt
 
+        append = event_list.append
+        events_resource = self.get_events()
         while 1:
-            if 'items' not in events:
+            items = events.get('items')
+            if items is None:
                 break
 
-            for event in events['items']:
+            for event in items:
 
                 event['gcalcli_cal'] = cal
 
-                if 'status' in event and event['status'] == 'cancelled':
+                if event.get('status') == 'cancelled':
                     continue
 
-                if 'dateTime' in event['start']:
-                    event['s'] = parse(event['start']['dateTime'])
-                else:
-                    # all date events
-                    event['s'] = parse(event['start']['date'])
-
-                event['s'] = self._localize_datetime(event['s'])
-
-                if 'dateTime' in event['end']:
-                    event['e'] = parse(event['end']['dateTime'])
-                else:
-                    # all date events
-                    event['e'] = parse(event['end']['date'])
-
-                event['e'] = self._localize_datetime(event['e'])
+                # all date events only have a date
+                start = event['start']
+                event['s'] = s = parse_time(start.get('dateTime') or
+                                            start['date'])
+                end_time = event['end']
+                event['e'] = e = parse_time(end_time.get('dateTime') or
+                                            end_time['date'])
 
                 # For all-day events, Google seems to assume that the event
                 # time is based in the UTC instead of the local timezone.  Here
                 # we filter out those events start beyond a specified end time.
-                if end and (event['s'] >= end):
+                if end and (s >= end):
                     continue
 
                 # http://en.wikipedia.org/wiki/Year_2038_problem
@@ -1071,19 +1299,18 @@ class GoogleCalendarInterface:
                 # module can choke throwing a ValueError exception. If either
                 # the start or end time for an event has a year '>= 2038' dump
                 # it.
-                if event['s'].year >= 2038 or event['e'].year >= 2038:
+                if s.year >= 2038 or e.year >= 2038:
                     continue
 
-                event_list.append(event)
+                append(event)
 
             pageToken = events.get('nextPageToken')
             if pageToken:
                 events = self._retry_with_backoff(
-                             self.get_events()
-                                 .list(
-                                     calendarId=cal['id'],
-                                     pageToken=pageToken
-                                 )
+                             events_resource.list(
+                                 calendarId=cal['id'],
+                                 pageToken=pageToken
+                             )
                          )
             else:
                 break
@@ -1091,32 +1318,64 @@ class GoogleCalendarInterface:
         return event_list
 
     def _search_for_events(self, start, end, search_text):
+        # builds the service, and with it the credentials, up front
+        events_resource = self.get_events()
+        params = {'timeMin': start.isoformat() if start else None,
+                  'timeMax': end.isoformat() if end else None,
+                  'q': search_text if search_text else None,
+                  'singleEvents': True,
+                  # each calendar's events come back as one sorted run
+                  'orderBy': 'startTime'}
+
+        def fetch(cal):
+            return self._retry_with_backoff(
+                    events_resource.list(calendarId=cal['id'], **params))
+
+        if len(self.cals) > 1:
+            # first pages of all calendars in a single round trip
+            first_pages = self.get_events_batch(
+                    [(cal['id'], params) for cal in self.cals])
+            # requests that failed in the batch (e.g. rate limited) are
+            # retried on their own
+            first_pages = [fetch(cal) if exception else response
+                           for cal, (response, exception)
+                           in zip(self.cals, first_pages)]
+        else:
+            first_pages = [fetch(cal) for cal in self.cals]
+
+        def get_all_events(cal, events):
+            return self._GetAllEvents(cal, events, end)
+
+        def init_worker():
+            self._thread_local.http = self._new_auth_http()
+
+        paged = sum('nextPageToken' in events for events in first_pages)
+        if paged > 1 and self.credentials:
+            # the remaining pages are fetched one calendar at a time, but the
+            # calendars themselves are independent
+            with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, paged),
+                                    initializer=init_worker) as executor:
+                cal_events = list(executor.map(get_all_events, self.cals,
+                                               first_pages))
+        else:
+            cal_events = list(map(get_all_events, self.cals, first_pages))
 
-        event_list = []
-        for cal in self.cals:
-            events = self._retry_with_backoff(
-                         self.get_events()
-                             .list(
-                                 calendarId=cal['id'],
-                                 timeMin=start.isoformat() if start else None,
-                                 timeMax=end.isoformat() if end else None,
-                                 q=search_text if search_text else None,
-                                 singleEvents=True
-                             )
-                    )
-            event_list.extend(self._GetAllEvents(cal, events, end))
-
-        event_list.sort(key=lambda x: x['s'])
+        event_list = list(chain.from_iterable(cal_events))
+        # the calendars are already sorted runs, which the sort merges in
+        # close to linear time; floats compare much faster than aware
+        # datetimes
+        event_list.sort(key=lambda x: x['s'].timestamp())
 
         return event_list
 
     def _DeclinedEvent(self, event):
-        if 'attendees' in event:
-            attendees = [a for a in event['attendees']
-                         if a['email'] == event['gcalcli_cal']['id']]
-            if attendees and attendees[0]['responseStatus'] == 'declined':
-                return True
-        return False
+        if 'attendees' not in event:
+            return False
+        cal_id = event['gcalcli_cal']['id']
+        attendee = next((a for a in event['attendees']
+                         if a['email'] == cal_id), None)
+        return attendee is not None and \
+            attendee['responseStatus'] == 'declined'
 
     def ListAllCalendars(self):
         access_len = 0
@@ -1131,27 +1390,18 @@ class GoogleCalendarInterface:
 
         _format = ' %0' + str(access_len) + 's  %s\n'
 
-        self.printer.msg(
-                _format % ('Access', 'Title'), self.options['color_title']
-        )
-        self.printer.msg(
-                _format % ('------', '-----'), self.options['color_title']
-        )
-
-        for cal in self.all_cals:
-            self.printer.msg(
-                    _format % (cal['accessRole'], cal['summary']),
-                    self._calendar_color(cal)
-            )
+        # written at once, not a write per calendar
+        lines = [(_format % ('Access', 'Title'), self.options['color_title']),
+                 (_format % ('------', '-----'), self.options['color_title'])]
+        lines.extend((_format % (cal['accessRole'], cal['summary']),
+                      self._calendar_color(cal))
+                     for cal in self.all_cals)
+        self.printer.msg_many(lines)
 
     def _display_queried_events(self, start, end, search=None,
                                 year_date=False):
         event_list = self._search_for_events(start, end, search)
-        for event in event_list:
-            event.pop("s", None)
-            event.pop("e", None)
-
-        print(json.dumps(event_list))
+        _print_events_json(event_list)
 
         # if self.options.get('tsv'):
         #     return self._tsv(start, event_list)
@@ -1172,10 +1422,20 @@ class GoogleCalendarInterface:
         if not end:
             end = (start + relativedelta(months=+1)).replace(day=1)
 
+        # updated is an RFC 3339 UTC time with milliseconds, and those sort
+        # as strings in time order, so compare without parsing every one
+        cutoff = last_updated_datetime.astimezone(timezone.utc)
+        cutoff_str = '%s.%03dZ' % (cutoff.strftime('%Y-%m-%dT%H:%M:%S'),
+                                   cutoff.microsecond // 1000)
+
+        def updated_since(event):
+            updated = event['updated']
+            if len(updated) == len(cutoff_str) and updated.endswith('Z'):
+                return updated >= cutoff_str
+            return utils.get_time_from_str(updated) >= last_updated_datetime
+
         event_list = self._search_for_events(start, end, None)
-        event_list = [e for e in event_list
-                      if (utils.get_time_from_str(e['updated']) >=
-                          last_updated_datetime)]
+        event_list = [e for e in event_list if updated_since(e)]
         print('Updates since:',
               last_updated_datetime,
               'events starting',
@@ -1242,16 +1502,12 @@ class GoogleCalendarInterface:
 
         # convert start date to the beginning of the week or month
         if cmd == 'calw':
-            day_num = self._cal_monday(int(start.strftime('%w')))
+            day_num = self._cal_monday(start.isoweekday() % 7)
             start = (start - timedelta(days=day_num))
             end = (start + timedelta(days=(count * 7)))
 
             event_list = self._search_for_events(start, end, None)
-            for event in event_list:
-                event.pop("s", None)
-                event.pop("e", None)
-
-            print(json.dumps(event_list))
+            _print_events_json(event_list)
         else:  # cmd == 'calm':
             start = (start - timedelta(days=(start.day - 1)))
             end_month = (start.month + 1)
@@ -1261,7 +1517,7 @@ class GoogleCalendarInterface:
                 end_year += 1
             end = start.replace(month=end_month, year=end_year)
             days_in_month = (end - start).days
-            offset_days = int(start.strftime('%w'))
+            offset_days = start.isoweekday() % 7
             if self.options['cal_monday']:
                 offset_days -= 1
                 if offset_days < 0:
@@ -1323,11 +1579,8 @@ class GoogleCalendarInterface:
             cals_with_write_perms = [cal for cal in self.cals
                                      if cal['accessRole'] in writers]
 
-            cal_names_with_idx = []
-            for idx, cal in enumerate(cals_with_write_perms):
-                cal_names_with_idx.append(str(idx) + ' ' + cal['summary'])
-            cal_names_with_idx = '\n'.join(cal_names_with_idx)
-            print(cal_names_with_idx)
+            print('\n'.join('%d %s' % (idx, cal['summary'])
+                            for idx, cal in enumerate(cals_with_write_perms)))
             val = get_input(self.printer, 'Specify calendar from above: ',
                             STR_TO_INT)
             try:
@@ -1371,15 +1624,27 @@ class GoogleCalendarInterface:
         return new_event
 
     def ModifyEvents(self, work, search_text, start=None, end=None,
-                     expert=False):
+                     expert=False, batch=False):
+        """Run work on every event matching search_text.
+
+        With batch, non-interactive (expert) deletions are sent as batch
+        requests after all matching events have been listed.
+        """
         if not search_text:
             raise GcalcliError('The empty string would get *ALL* events')
 
         event_list = self._search_for_events(start, end, search_text)
         self.expert = expert
-        return self._iterate_events(
+        self.pending_deletes = [] if batch else None
+        selected = self._iterate_events(
                 self.now, event_list, year_date=True, work=work)
 
+        if self.pending_deletes:
+            self._delete_batch(self.pending_deletes)
+        self.pending_deletes = None
+
+        return selected
+
     def Remind(self, minutes, command, use_reminders=False):
         """
         Check for events between now and now+minutes.
@@ -1388,100 +1653,100 @@ class GoogleCalendarInterface:
         """
 
         # perform a date query for now + minutes + slip
-        start = self.now
+        now = start = self.now
         end = (start + timedelta(minutes=(minutes + 5)))
 
         event_list = self._search_for_events(start, end, None)
 
-        message = ''
+        lines = []
+        military = self.options.get('military')
 
         for event in event_list:
+            s = event['s']
 
             # skip this event if it already started
             # XXX maybe add a 2+ minute grace period here...
-            if event['s'] < self.now:
+            if s < now:
                 continue
 
             # not sure if 'reminders' always in event
             if use_reminders and 'reminders' in event \
                     and 'overrides' in event['reminders']:
-                if all(event['s'] - timedelta(minutes=r['minutes']) > self.now
+                if all(s - timedelta(minutes=r['minutes']) > now
                         for r in event['reminders']['overrides']):
                     # don't remind if all reminders haven't arrived yet
                     continue
 
-            if self.options.get('military'):
-                tmp_time_str = event['s'].strftime('%H:%M')
+            if military:
+                tmp_time_str = s.strftime('%H:%M')
             else:
                 tmp_time_str = \
-                    event['s'].strftime('%I:%M').lstrip('0') + \
-                    event['s'].strftime('%p').lower()
+                    s.strftime('%I:%M').lstrip('0') + \
+                    s.strftime('%p').lower()
 
-            message += '%s  %s\n' % \
-                       (tmp_time_str, _valid_title(event).strip())
+            lines.append('%s  %s\n' %
+                         (tmp_time_str, _valid_title(event).strip()))
 
-        if not message:
+        if not lines:
             return
 
-        cmd = shlex.split(command)
-
-        for i, a in zip(range(len(cmd)), cmd):
-            if a == '%s':
-                cmd[i] = message
+        message = ''.join(lines)
+        cmd = [message if arg == '%s' else arg
+               for arg in shlex.split(command)]
 
         pid = os.fork()
         if not pid:
             os.execvp(cmd[0], cmd)
 
     def ImportICS(self, verbose=False, dump=False, reminders=None,
-                  icsFile=None):
+                  icsFile=None, batch=False):
 
         def CreateEventFromVOBJ(ve):
 
             event = {}
+            # verbose output is collected and written once per event
+            lines = []
+            emit = lines.append if verbose else (lambda line: None)
 
-            if verbose:
-                print('+----------------+')
-                print('| Calendar Event |')
-                print('+----------------+')
+            emit('+----------------+\n'
+                 '| Calendar Event |\n'
+                 '+----------------+\n')
 
             if hasattr(ve, 'summary'):
-                if verbose:
-                    print('Event........%s' % ve.summary.value)
+                emit('Event........%s\n' % ve.summary.value)
                 event['summary'] = ve.summary.value
 
             if hasattr(ve, 'location'):
-                if verbose:
-                    print('Location.....%s' % ve.location.value)
+                emit('Location.....%s\n' % ve.location.value)
                 event['location'] = ve.location.value
 
-            if not hasattr(ve, 'dtstart') or not hasattr(ve, 'dtend'):
+            dtstart = getattr(ve, 'dtstart', None)
+            dtend = getattr(ve, 'dtend', None)
+            if dtstart is None or dtend is None:
+                sys.stdout.write(''.join(lines))
                 self.printer.err_msg(
                         'Error: event does not have a dtstart and dtend!\n'
                 )
                 return None
 
             if verbose:
-                if ve.dtstart.value:
-                    print('Start........%s' % ve.dtstart.value.isoformat())
-                if ve.dtend.value:
-                    print('End..........%s' % ve.dtend.value.isoformat())
-                if ve.dtstart.value:
-                    print('Local Start..%s' %
-                          self._localize_datetime(ve.dtstart.value)
-                          )
-                if ve.dtend.value:
-                    print('Local End....%s' %
-                          self._localize_datetime(ve.dtend.value)
-                          )
+                if dtstart.value:
+                    emit('Start........%s\n' % dtstart.value.isoformat())
+                if dtend.value:
+                    emit('End..........%s\n' % dtend.value.isoformat())
+                if dtstart.value:
+                    emit('Local Start..%s\n' %
+                         self._localize_datetime(dtstart.value))
+                if dtend.value:
+                    emit('Local End....%s\n' %
+                         self._localize_datetime(dtend.value))
 
             if hasattr(ve, 'rrule'):
-                if verbose:
-                    print('Recurrence...%s' % ve.rrule.value)
+                emit('Recurrence...%s\n' % ve.rrule.value)
 
                 event['recurrence'] = ['RRULE:' + ve.rrule.value]
 
-            if hasattr(ve, 'dtstart') and ve.dtstart.value:
+            if dtstart.value:
                 # XXX
                 # Timezone madness! Note that we're using the timezone for the
                 # calendar being added to. This is OK if the event is in the
@@ -1497,8 +1762,8 @@ class GoogleCalendarInterface:
                 # print dir(ve.dtstart.value.tzinfo)
                 # print vars(ve.dtstart.value.tzinfo)
 
-                start = ve.dtstart.value.isoformat()
-                if isinstance(ve.dtstart.value, datetime):
+                start = dtstart.value.isoformat()
+                if isinstance(dtstart.value, datetime):
                     event['start'] = {'dateTime': start,
                                       'timeZone': self.cals[0]['timeZone']}
                 else:
@@ -1508,9 +1773,9 @@ class GoogleCalendarInterface:
 
                 # Can only have an end if we have a start, but not the other
                 # way around apparently...  If there is no end, use the start
-                if hasattr(ve, 'dtend') and ve.dtend.value:
-                    end = ve.dtend.value.isoformat()
-                    if isinstance(ve.dtend.value, datetime):
+                if dtend.value:
+                    end = dtend.value.isoformat()
+                    if isinstance(dtend.value, datetime):
                         event['end'] = {'dateTime': end,
                                         'timeZone': self.cals[0]['timeZone']}
                     else:
@@ -1521,8 +1786,7 @@ class GoogleCalendarInterface:
 
             if hasattr(ve, 'description') and ve.description.value.strip():
                 descr = ve.description.value.strip()
-                if verbose:
-                    print('Description:\n%s' % descr)
+                emit('Description:\n%s\n' % descr)
                 event['description'] = descr
 
             if hasattr(ve, 'organizer'):
@@ -1530,26 +1794,24 @@ class GoogleCalendarInterface:
                     email = ve.organizer.value[7:]
                 else:
                     email = ve.organizer.value
-                if verbose:
-                    print('organizer:\n %s' % email)
+                emit('organizer:\n %s\n' % email)
                 event['organizer'] = {'displayName': ve.organizer.name,
                                       'email': email}
 
             if hasattr(ve, 'attendee_list'):
-                if verbose:
-                    print('attendees:')
+                emit('attendees:\n')
                 event['attendees'] = []
                 for attendee in ve.attendee_list:
                     if attendee.value.upper().startswith('MAILTO:'):
                         email = attendee.value[7:]
                     else:
                         email = attendee.value
-                    if verbose:
-                        print(' %s' % email)
+                    emit(' %s\n' % email)
 
                     event['attendees'].append({'displayName': attendee.name,
                                                'email': email})
 
+            sys.stdout.write(''.join(lines))
             return event
 
         try:
@@ -1575,6 +1837,18 @@ class GoogleCalendarInterface:
                 self.printer.err_msg('Error: ' + str(e) + '!\n')
                 sys.exit(1)
 
+        def added(new_event, exception):
+            if exception:
+                self.printer.err_msg('Error: %s\n' % exception)
+            else:
+                hlink = new_event.get('htmlLink')
+                self.printer.msg('New event added: %s\n' % hlink, 'green')
+
+        # non-interactive inserts to be sent as batch requests
+        pending = []
+        # a dump only prints, don't build (and authorize) the service for it
+        events = None if dump else self.get_events()
+
         while True:
             try:
                 v = next(vobject.readComponents(f))
@@ -1590,13 +1864,26 @@ class GoogleCalendarInterface:
                 if dump:
                     continue
 
+                if not verbose and batch:
+                    pending.append((
+                        events.insert(
+                            calendarId=self.cals[0]['id'], body=event
+                        ),
+                        added
+                    ))
+                    # send full batches as they fill up rather than holding
+                    # the whole file's events until the end
+                    if len(pending) >= self.batch_size:
+                        self._execute_batch(pending)
+                        pending = []
+                    continue
+
                 if not verbose:
                     new_event = self._retry_with_backoff(
-                                    self.get_events()
-                                        .insert(
-                                            calendarId=self.cals[0]['id'],
-                                            body=event
-                                        )
+                                    events.insert(
+                                        calendarId=self.cals[0]['id'],
+                                        body=event
+                                    )
                                 )
                     hlink = new_event.get('htmlLink')
                     self.printer.msg(
@@ -1610,11 +1897,10 @@ class GoogleCalendarInterface:
                     continue
                 if val.lower() == 'i':
                     new_event = self._retry_with_backoff(
-                                    self.get_events()
-                                        .insert(
-                                            calendarId=self.cals[0]['id'],
-                                            body=event
-                                        )
+                                    events.insert(
+                                        calendarId=self.cals[0]['id'],
+                                        body=event
+                                    )
                                 )
                     hlink = new_event.get('htmlLink')
                     self.printer.msg('New event added: %s\n' % hlink, 'green')
@@ -1623,5 +1909,9 @@ class GoogleCalendarInterface:
                 else:
                     self.printer.err_msg('Error: invalid input\n')
                     sys.exit(1)
+
+        if pending:
+            self._execute_batch(pending)
+
         # TODO: return the number of events added
         return True
@@ -88,6 +88,15 @@ class Printer(object):
             msg = self.colors[colorname] + msg + self.colors['default']
         file.write(msg)
 
+    def msg_many(self, pieces, file=sys.stdout):
+        """Write a sequence of (msg, colorname) pairs in a single write"""
+        if self.use_color:
+            default = self.colors['default']
+            file.write(''.join(self.colors[colorname] + msg + default
+                               for msg, colorname in pieces))
+        else:
+            file.write(''.join(msg for msg, _ in pieces))
+
     def err_msg(self, msg):
         self.msg(msg, 'brightred', file=sys.stderr)
 
@@ -1,36 +1,71 @@
-import calendar
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 import locale
 import re
 import time
+from typing import Any, Optional, Tuple, Union
 
 from dateutil.parser import parse as dateutil_parse
 from dateutil.tz import tzlocal
-from parsedatetime.parsedatetime import Calendar
+
+from ._types import Event
 
 locale.setlocale(locale.LC_ALL, '')
-fuzzy_date_parse = Calendar().parse
-fuzzy_datetime_parse = Calendar().parseDT
+TZLOCAL = tzlocal()
+DAY_SECONDS = 24 * 60 * 60
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+# longest input handed to parsedatetime
+FUZZY_MAX_LEN = 64
 
 
-REMINDER_REGEX = r'^(\d+)([wdhm]?)(?:\s+(popup|email|sms))?$'
+# both patterns are matched with fullmatch, which anchors them at both ends
+REMINDER_REGEX = re.compile(r'(\d+)([wdhm]?)(?:\s+(popup|email|sms))?')
 
+# a number can never run into its unit, so the greedy groups have a single
+# way to match and failing input doesn't backtrack through every split
 DURATION_REGEX = re.compile(
-                r'^((?P<days>[\.\d]+?)(?:d|day|days))?[ :]*'
-                r'((?P<hours>[\.\d]+?)(?:h|hour|hours))?[ :]*'
-                r'((?P<minutes>[\.\d]+?)(?:m|min|mins|minute|minutes))?[ :]*'
-                r'((?P<seconds>[\.\d]+?)(?:s|sec|secs|second|seconds))?$'
+                r'((?P<days>[\.\d]+) *(?:days?|d))?[ :]*'
+                r'((?P<hours>[\.\d]+) *(?:hours?|h))?[ :]*'
+                r'((?P<minutes>[\.\d]+) *(?:minutes?|mins?|m))?[ :]*'
+                r'((?P<seconds>[\.\d]+) *(?:seconds?|secs?|s))?'
                 )
 
 
-def parse_reminder(rem):
-    match = re.match(REMINDER_REGEX, rem)
-    if not match:
-        # Allow argparse to generate a message when parsing options
+@lru_cache(maxsize=None)
+def _fuzzy_calendar():
+    # only needed when dateutil can't parse the input, so parsedatetime isn't
+    # even imported until then
+    from parsedatetime.parsedatetime import Calendar
+    return Calendar()
+
+
+def __getattr__(name: str) -> Any:
+    # the fuzzy parsers used to be created at import time, keep their names
+    # working without paying for parsedatetime up front
+    if name == 'fuzzy_date_parse':
+        return _fuzzy_calendar().parse
+    if name == 'fuzzy_datetime_parse':
+        return _fuzzy_calendar().parseDT
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
+
+
+def parse_reminder(rem: str) -> Optional[Tuple[int, str]]:
+    # reminders start with a number, skip the regex for anything else
+    if not rem or not rem[0].isdigit():
         return None
-    n = int(match.group(1))
-    t = match.group(2)
-    m = match.group(3)
+    # the common '10' and '10m' forms are split without the regex
+    if rem[-1] in 'wdhm' and rem[:-1].isdecimal():
+        n, t, m = int(rem[:-1]), rem[-1], None
+    elif rem.isdecimal():
+        n, t, m = int(rem), '', None
+    else:
+        match = REMINDER_REGEX.fullmatch(rem)
+        if not match:
+            # Allow argparse to generate a message when parsing options
+            return None
+        n = int(match.group(1))
+        t = match.group(2)
+        m = match.group(3)
     if t == 'w':
         n = n * 7 * 24 * 60
     elif t == 'd':
@@ -44,7 +79,7 @@ def parse_reminder(rem):
     return n, m
 
 
-def set_locale(new_locale):
+def set_locale(new_locale: str) -> None:
     try:
         locale.setlocale(locale.LC_ALL, new_locale)
     except locale.Error as exc:
@@ -53,7 +88,9 @@ def set_locale(new_locale):
                 '!\n Check supported locales of your system.\n')
 
 
-def get_times_from_duration(when, duration=0, allday=False):
+def get_times_from_duration(
+        when: str, duration: Union[str, float] = 0, allday: bool = False
+) -> Tuple[str, str]:
 
     try:
         start = get_time_from_str(when)
@@ -83,25 +120,64 @@ def get_times_from_duration(when, duration=0, allday=False):
     return start, stop
 
 
-def get_time_from_str(when):
+@lru_cache(maxsize=1)
+def _zero_oclock(day: date) -> datetime:
+    # only recomputed once the date rolls over
+    return datetime(day.year, day.month, day.day, tzinfo=TZLOCAL)
+
+
+@lru_cache(maxsize=4096)
+def _dateutil_parse(when: str, default: datetime) -> datetime:
+    # keyed on the default too, so dates relative to today are only reused
+    # within the same day
+    return dateutil_parse(when, default=default)
+
+
+def get_time_from_str(when: str) -> datetime:
     """Convert a string to a time: first uses the dateutil parser, falls back
     on fuzzy matching with parsedatetime
     """
-    zero_oclock_today = datetime.now(tzlocal()).replace(
-            hour=0, minute=0, second=0, microsecond=0)
+    # ISO 8601 dates, as stored by Google, parse much faster natively
+    if len(when) >= 10 and when[4] == '-':
+        try:
+            event_time = datetime.fromisoformat(when)
+        except ValueError:
+            pass
+        else:
+            # dateutil would take the time zone from the default below
+            return event_time if event_time.tzinfo else \
+                event_time.replace(tzinfo=TZLOCAL)
+
+    zero_oclock_today = _zero_oclock(date.today())
 
     try:
-        event_time = dateutil_parse(when, default=zero_oclock_today)
+        event_time = _dateutil_parse(when, zero_oclock_today)
     except ValueError:
-        struct, result = fuzzy_date_parse(when)
+        # fuzzy matches may be relative to the current time, never cache them
+        struct, result = _fuzzy_calendar().parse(when)
         if not result:
             raise ValueError('Date and time is invalid: %s' % (when))
-        event_time = datetime.fromtimestamp(time.mktime(struct), tzlocal())
+        event_time = datetime.fromtimestamp(time.mktime(struct), TZLOCAL)
 
     return event_time
 
 
-def get_timedelta_from_str(delta):
+def _fuzzy_parsable(text: str) -> bool:
+    # parsedatetime is slow, don't bother it with text it can't make sense of
+    return (len(text) <= FUZZY_MAX_LEN and text.isascii() and
+            any(char.isalnum() for char in text))
+
+
+@lru_cache(maxsize=256)
+def _fuzzy_timedelta(delta: str) -> Optional[timedelta]:
+    # failures are cached as well, so an interactive prompt retried with the
+    # same invalid input doesn't go through parsedatetime again
+    dt, result = _fuzzy_calendar().parseDT(delta, sourceTime=datetime.min)
+    return dt - datetime.min if result else None
+
+
+@lru_cache(maxsize=4096)
+def get_timedelta_from_str(delta: Union[str, float]) -> timedelta:
     """
     Parse a time string a timedelta object.
     Formats:
@@ -116,7 +192,7 @@ def get_timedelta_from_str(delta):
     except ValueError:
         pass
     if parsed_delta is None:
-        parts = DURATION_REGEX.match(delta)
+        parts = DURATION_REGEX.fullmatch(delta)
         if parts is not None:
             try:
                 time_params = {name: float(param)
@@ -125,30 +201,34 @@ def get_timedelta_from_str(delta):
                 parsed_delta = timedelta(**time_params)
             except ValueError:
                 pass
-    if parsed_delta is None:
-        dt, result = fuzzy_datetime_parse(delta, sourceTime=datetime.min)
-        if result:
-            parsed_delta = dt - datetime.min
+    if parsed_delta is None and _fuzzy_parsable(delta):
+        parsed_delta = _fuzzy_timedelta(delta)
     if parsed_delta is None:
         raise ValueError('Duration is invalid: %s' % (delta))
     return parsed_delta
 
 
-def days_since_epoch(dt):
-    __DAYS_IN_SECONDS__ = 24 * 60 * 60
-    return calendar.timegm(dt.timetuple()) / __DAYS_IN_SECONDS__
+def days_since_epoch(dt: datetime) -> float:
+    # the wall clock time counted as UTC, as calendar.timegm(dt.timetuple())
+    # would, without building the time tuple
+    seconds = ((dt.toordinal() - EPOCH_ORDINAL) * DAY_SECONDS +
+               dt.hour * 3600 + dt.minute * 60 + dt.second)
+    return seconds / DAY_SECONDS
 
 
-def agenda_time_fmt(dt, military):
-    hour_min_fmt = '%H:%M' if military else '%I:%M'
-    ampm = '' if military else dt.strftime('%p').lower()
-    return dt.strftime(hour_min_fmt).lstrip('0') + ampm
+def agenda_time_fmt(dt: datetime, military: bool) -> str:
+    if military:
+        return '%d:%02d' % (dt.hour, dt.minute)
+    # only the am/pm marker depends on the locale
+    return '%d:%02d%s' % (dt.hour % 12 or 12, dt.minute,
+                          dt.strftime('%p').lower())
 
 
-def is_all_day(event):
+def is_all_day(event: Event) -> bool:
     # XXX: currently gcalcli represents all-day events as those that both begin
     # and end at midnight. This is ambiguous with Google Calendar events that
     # are not all-day but happen to begin and end at midnight.
 
-    return (event['s'].hour == 0 and event['s'].minute == 0
-            and event['e'].hour == 0 and event['e'].minute == 0)
+    s, e = event['s'], event['e']
+    # hours and minutes are never negative, so this is zero only if all are
+    return not (s.hour | s.minute | e.hour | e.minute)
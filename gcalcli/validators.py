@@ -1,25 +1,44 @@
-import re
+from types import MappingProxyType
 
 from .exceptions import ValidationError
 from .utils import get_time_from_str, get_timedelta_from_str, REMINDER_REGEX
 
 # TODO: in the future, pull these from the API
 # https://developers.google.com/calendar/v3/reference/colors
-VALID_OVERRIDE_COLORS = ['lavender', 'sage', 'grape', 'flamingo',
+VALID_OVERRIDE_COLORS = ('lavender', 'sage', 'grape', 'flamingo',
                          'banana', 'tangerine', 'peacock', 'graphite',
-                         'blueberry', 'basil', 'tomato']
+                         'blueberry', 'basil', 'tomato')
+# read-only, the ids are fixed by the API
+OVERRIDE_COLOR_IDS = MappingProxyType({
+        color: str(idx) for idx, color in enumerate(VALID_OVERRIDE_COLORS, 1)})
+# blank input keeps the current color
+VALID_COLOR_INPUTS = frozenset(VALID_OVERRIDE_COLORS) | {''}
 
+# besides letters, digits and whitespace, dates and durations are only
+# written with these, so don't bother the parsers with anything else
+PARSABLE_PUNCTUATION = frozenset(" :/.-+,'_")
+PARSABLE_MAX_LEN = 64
 
-def get_override_color_id(color):
-    return str(VALID_OVERRIDE_COLORS.index(color) + 1)
+
+def _parsable(input_str):
+    input_str = input_str.strip()
+    return (len(input_str) <= PARSABLE_MAX_LEN and
+            all(char.isalnum() or char.isspace() or
+                char in PARSABLE_PUNCTUATION for char in input_str))
+
+
+def get_override_color_id(color: str) -> str:
+    try:
+        return OVERRIDE_COLOR_IDS[color]
+    except KeyError:
+        raise ValueError('%r is not a valid color' % color)
 
 
 def get_input(printer, prompt, validator_func):
     printer.msg(prompt, 'magenta')
     while True:
         try:
-            output = validate_input(validator_func)
-            return output
+            return validator_func(input())
         except ValidationError as e:
             printer.msg(e.message, 'red')
             printer.msg(prompt, 'magenta')
@@ -32,14 +51,12 @@ def color_validator(input_str):
 
     Raises ValidationError otherwise.
     """
-    try:
-        assert input_str in VALID_OVERRIDE_COLORS + ['']
+    if input_str in VALID_COLOR_INPUTS:
         return input_str
-    except AssertionError:
-        raise ValidationError(
-                'Expected colors are: ' +
-                ', '.join(color for color in VALID_OVERRIDE_COLORS) +
-                '. (Ctrl-C to exit)\n')
+    raise ValidationError(
+            'Expected colors are: ' +
+            ', '.join(VALID_OVERRIDE_COLORS) +
+            '. (Ctrl-C to exit)\n')
 
 
 def str_to_int_validator(input_str):
@@ -64,14 +81,16 @@ def parsable_date_validator(input_str):
     Raises ValidationError otherwise.
     """
     try:
-        get_time_from_str(input_str)
-        return input_str
+        if _parsable(input_str):
+            get_time_from_str(input_str)
+            return input_str
     except ValueError:
-        raise ValidationError(
-            'Expected format: a date (e.g. 2019-01-01, tomorrow 10am, '
-            '2nd Jan, Jan 4th, etc) or valid time if today. '
-            '(Ctrl-C to exit)\n'
-        )
+        pass
+    raise ValidationError(
+        'Expected format: a date (e.g. 2019-01-01, tomorrow 10am, '
+        '2nd Jan, Jan 4th, etc) or valid time if today. '
+        '(Ctrl-C to exit)\n'
+    )
 
 
 def parsable_duration_validator(input_str):
@@ -81,13 +100,15 @@ def parsable_duration_validator(input_str):
     Raises ValidationError otherwise.
     """
     try:
-        get_timedelta_from_str(input_str)
-        return input_str
+        if _parsable(input_str):
+            get_timedelta_from_str(input_str)
+            return input_str
     except ValueError:
-        raise ValidationError(
-            'Expected format: a duration (e.g. 1m, 1s, 1h3m)'
-            '(Ctrl-C to exit)\n'
-        )
+        pass
+    raise ValidationError(
+        'Expected format: a duration (e.g. 1m, 1s, 1h3m)'
+        '(Ctrl-C to exit)\n'
+    )
 
 
 def str_allow_empty_validator(input_str):
@@ -103,12 +124,11 @@ def non_blank_str_validator(input_str):
     A simple filter allowing string len > 1 and not None
     Raises ValidationError otherwise.
     """
-    if input_str in [None, '']:
+    if not input_str:
         raise ValidationError(
             'Input here cannot be empty. (Ctrl-C to exit)\n'
         )
-    else:
-        return input_str
+    return input_str
 
 
 def reminder_validator(input_str):
@@ -116,7 +136,7 @@ def reminder_validator(input_str):
     Allows a string that matches utils.REMINDER_REGEX.
     Raises ValidationError otherwise.
     """
-    match = re.match(REMINDER_REGEX, input_str)
+    match = REMINDER_REGEX.fullmatch(input_str)
     if match or input_str == '.':
         return input_str
     else:
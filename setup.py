@@ -42,6 +42,7 @@ setup(name='gcalcli',
       ],
       extras_require={
           'vobject': ["vobject"],
+          'orjson': ["orjson"],
       },
       entry_points={
           'console_scripts':
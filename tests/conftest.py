@@ -90,6 +90,15 @@ def PatchedGCalIForEvents(monkeypatch):
             msg = self.colors[colorname] + msg + self.colors['default']
         sys.stdout.write(msg)
 
+    def mocked_msg_many(self, pieces, file=sys.stdout):
+        for msg, colorname in pieces:
+            mocked_msg(self, msg, colorname)
+
+    def mocked_execute_batch(self, requests):
+        # HttpMock can't answer with a multipart batch response
+        for request, callback in requests:
+            callback(request.execute(), None)
+
     monkeypatch.setattr(
             GoogleCalendarInterface, '_search_for_events',
             mocked_search_for_events
@@ -101,6 +110,10 @@ def PatchedGCalIForEvents(monkeypatch):
             GoogleCalendarInterface, '_get_cached', mocked_calendar_list
     )
     monkeypatch.setattr(Printer, 'msg', mocked_msg)
+    monkeypatch.setattr(Printer, 'msg_many', mocked_msg_many)
+    monkeypatch.setattr(
+            GoogleCalendarInterface, '_execute_batch', mocked_execute_batch
+    )
 
     def _init(**opts):
         return GoogleCalendarInterface(use_cache=False, **opts)
@@ -136,6 +149,15 @@ def PatchedGCalI(monkeypatch):
             msg = self.colors[colorname] + msg + self.colors['default']
         sys.stdout.write(msg)
 
+    def mocked_msg_many(self, pieces, file=sys.stdout):
+        for msg, colorname in pieces:
+            mocked_msg(self, msg, colorname)
+
+    def mocked_execute_batch(self, requests):
+        # HttpMock can't answer with a multipart batch response
+        for request, callback in requests:
+            callback(request.execute(), None)
+
     monkeypatch.setattr(
             GoogleCalendarInterface, 'get_cal_service', mocked_calendar_service
     )
@@ -143,6 +165,10 @@ def PatchedGCalI(monkeypatch):
             GoogleCalendarInterface, '_get_cached', mocked_calendar_list
     )
     monkeypatch.setattr(Printer, 'msg', mocked_msg)
+    monkeypatch.setattr(Printer, 'msg_many', mocked_msg_many)
+    monkeypatch.setattr(
+            GoogleCalendarInterface, '_execute_batch', mocked_execute_batch
+    )
 
     def _init(**opts):
         return GoogleCalendarInterface(use_cache=False, **opts)
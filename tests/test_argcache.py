@@ -0,0 +1,74 @@
+from argparse import Namespace
+from datetime import datetime
+import os
+
+from gcalcli import argcache
+from gcalcli.argparsers import get_argument_parser
+
+
+def test_store_and_load(monkeypatch, tmp_path):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    gcalclirc = tmp_path / 'gcalclirc'
+
+    key = argcache.get_key(['agenda'], str(gcalclirc))
+    assert argcache.load(key) is None
+
+    parsed_args = Namespace(command='agenda', config_folder=None, start=None)
+    argcache.store(key, parsed_args, ['--unparsed'])
+    assert argcache.load(key) == (parsed_args, ['--unparsed'])
+    # only the owner may read it, and no temporary files are left behind
+    cache_file = argcache.get_cache_file()
+    assert os.stat(cache_file).st_mode & 0o777 == 0o600
+    assert os.listdir(os.path.dirname(cache_file)) == ['argparse.pkl']
+
+    # a changed rc file invalidates the cached result
+    gcalclirc.write_text('--nocolor\n')
+    assert argcache.get_key(['agenda'], str(gcalclirc)) != key
+
+
+def test_relative_dates_not_cached(monkeypatch, tmp_path):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+
+    key = argcache.get_key(['agenda', 'tomorrow'], '')
+    parsed_args = Namespace(command='agenda', config_folder=None,
+                            start=datetime.now())
+    argcache.store(key, parsed_args, [])
+    assert argcache.load(key) is None
+
+
+def test_flagfiles_in_key(tmp_path):
+    gcalclirc = tmp_path / 'gcalclirc'
+    rc_flags = tmp_path / 'rc_flags'
+    gcalclirc.write_text('@%s\n' % rc_flags)
+    flags = tmp_path / 'flags'
+    flags.write_text('--nocolor\n')
+    argv = ['@%s' % flags, 'agenda']
+
+    key = argcache.get_key(argv, str(gcalclirc))
+    assert argcache.get_key(argv, str(gcalclirc)) == key
+
+    # editing an @file named in argv invalidates the cached result
+    flags.write_text('--nocolor\n--lineart=ascii\n')
+    key, old_key = argcache.get_key(argv, str(gcalclirc)), key
+    assert key != old_key
+
+    # and so does creating one the rc file refers to
+    rc_flags.write_text('--nocolor\n')
+    assert argcache.get_key(argv, str(gcalclirc)) != key
+
+
+def test_deprecated_opts_not_cached(monkeypatch, tmp_path):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    argv = ['--defaultCalendar', 'cal', 'agenda']
+    parsed_args, unparsed = get_argument_parser().parse_known_args(argv)
+
+    key = argcache.get_key(argv, '')
+    argcache.store(key, parsed_args, unparsed)
+    assert argcache.load(key) is None
+
+
+def test_enabled(monkeypatch):
+    monkeypatch.delenv(argcache.ENABLE_VAR, raising=False)
+    assert not argcache.enabled()
+    monkeypatch.setenv(argcache.ENABLE_VAR, '1')
+    assert argcache.enabled()
@@ -12,6 +12,24 @@ def test_get_argparser():
     assert argparser
 
 
+def test_get_argparser_single_command():
+    argv = shlex.split('agenda today tomorrow')
+    command = argparsers.get_command_name(argv)
+    assert command == 'agenda'
+
+    parser = argparsers.get_argument_parser(command)
+    assert parser.parse_args(argv).command == 'agenda'
+
+    # only the requested subparser is built
+    with pytest.raises(SystemExit):
+        parser.parse_args(['list'])
+
+    # ambiguous or missing commands build every subparser
+    assert argparsers.get_command_name(['--calendar', 'list', 'agenda']) \
+        is None
+    assert argparsers.get_command_name(['--help']) is None
+
+
 def test_reminder_parser():
     remind_parser = argparsers.get_remind_parser()
     argv = shlex.split('--reminder invalid reminder')
@@ -1,20 +1,29 @@
 from __future__ import absolute_import
 
-from datetime import datetime
+from argparse import Namespace
+from datetime import datetime, timedelta
+import json
 from json import load
 import os
+import pickle
 
 from dateutil.tz import tzutc
+from googleapiclient.errors import HttpError
+import httplib2
 
 from gcalcli.argparsers import (get_cal_query_parser, get_color_parser,
                                 get_conflicts_parser, get_output_parser,
                                 get_search_parser, get_start_end_parser,
                                 get_updates_parser)
 from gcalcli.cli import parse_cal_names
-from gcalcli.gcal import GoogleCalendarInterface
+from gcalcli.gcal import (_print_json, CACHE_SCHEMA_VERSION,
+                          GoogleCalendarInterface)
 from gcalcli.utils import parse_reminder
 
 TEST_DATA_DIR = os.path.dirname(os.path.abspath(__file__)) + '/data'
+# the fixtures patch these out, keep handles for the tests of them
+get_cached = GoogleCalendarInterface._get_cached
+execute_batch = GoogleCalendarInterface._execute_batch
 
 
 # TODO: These are more like placeholders for proper unit tests
@@ -38,6 +47,13 @@ def test_list(capsys, PatchedGCalI):
     assert len(captured.out.split('\n')) == cal_count + 3
 
 
+def test_args_namespace(PatchedGCalI, default_options):
+    args = Namespace(**default_options)
+    gcal = PatchedGCalI(args=args)
+    assert gcal.options is vars(args)
+    assert gcal.options['use_cache'] is False
+
+
 def test_agenda(PatchedGCalI):
     assert PatchedGCalI().AgendaQuery() == 0
 
@@ -60,6 +76,18 @@ def test_updates(PatchedGCalI):
             end=opts.end) == 0
 
 
+def test_updates_since(PatchedGCalI, monkeypatch):
+    gcal = PatchedGCalI()
+    event_list = [{'updated': '2019-07-09T23:59:59.999Z'},
+                  {'updated': '2019-07-10T00:00:00.000Z'},
+                  {'updated': '2019-07-10T12:00:00Z'}]
+    monkeypatch.setattr(gcal, '_search_for_events', lambda *args: event_list)
+    monkeypatch.setattr(gcal, '_iterate_events',
+                        lambda start, event_list, year_date: event_list)
+    since = datetime(2019, 7, 10, tzinfo=tzutc())
+    assert gcal.UpdatesQuery(since) == event_list[1:]
+
+
 def test_conflicts(PatchedGCalI):
     assert PatchedGCalI().ConflictsQuery() == 0
 
@@ -222,6 +250,242 @@ def test_import(PatchedGCalI):
     assert gcal.ImportICS(icsFile=open(vcal_path))
 
 
+def test_import_batch(PatchedGCalI, monkeypatch):
+    cal_names = parse_cal_names(['jcrowgey@uw.edu'])
+    gcal = PatchedGCalI(cal_names=cal_names, default_reminders=True)
+    batched = []
+    monkeypatch.setattr(gcal, '_execute_batch', batched.extend)
+    vcal_path = TEST_DATA_DIR + '/vv.txt'
+    assert gcal.ImportICS(icsFile=open(vcal_path), batch=True)
+    assert len(batched) == 1
+
+    # full batches are sent while the file is still being read
+    batches = []
+    monkeypatch.setattr(gcal, '_execute_batch', batches.append)
+    monkeypatch.setattr(gcal, 'batch_size', 1)
+    assert gcal.ImportICS(icsFile=open(vcal_path), batch=True)
+    assert [len(requests) for requests in batches] == [1]
+
+
+def test_delete_batch(PatchedGCalI, default_options, monkeypatch):
+    gcal = PatchedGCalI(**default_options)
+    event = {'id': 'event_id', 'summary': 'test',
+             'gcalcli_cal': {'id': 'cal_id', 'accessRole': 'owner'},
+             's': datetime(2019, 1, 8, 14, 15, tzinfo=tzutc()),
+             'e': datetime(2019, 1, 8, 15, 15, tzinfo=tzutc())}
+    monkeypatch.setattr(gcal, '_search_for_events', lambda *args: [event])
+    batched = []
+    monkeypatch.setattr(gcal, '_delete_batch', batched.extend)
+    assert gcal.ModifyEvents(gcal._delete_event, 'test', expert=True,
+                             batch=True) == 1
+    assert batched == [('cal_id', 'event_id')]
+
+
+def test_get_all_events(PatchedGCalI):
+    gcal = PatchedGCalI()
+    cal = {'id': 'cal_id'}
+    events = {'items': [
+        {'status': 'cancelled',
+         'start': {'date': '2019-01-08'}, 'end': {'date': '2019-01-09'}},
+        {'start': {'date': '2019-01-08'}, 'end': {'date': '2019-01-09'}},
+        {'start': {'dateTime': '2019-01-08T14:15:00Z'},
+         'end': {'dateTime': '2019-01-08T15:15:00Z'}},
+        {'start': {'date': '2040-01-08'}, 'end': {'date': '2040-01-09'}},
+    ]}
+    event_list = gcal._GetAllEvents(cal, events, None)
+    assert len(event_list) == 2
+    allday, timed = event_list
+    assert allday['gcalcli_cal'] is cal
+    assert (allday['s'].date(), allday['e'].date()) == \
+        (datetime(2019, 1, 8).date(), datetime(2019, 1, 9).date())
+    assert timed['s'] == datetime(2019, 1, 8, 14, 15, tzinfo=tzutc())
+    assert timed['e'] - timed['s'] == timedelta(hours=1)
+    assert timed['s'].tzinfo is not None
+
+
+def test_search_for_events_threaded(PatchedGCalI, monkeypatch):
+    gcal = PatchedGCalI()
+    gcal.cals = [{'id': 'cal%d' % i} for i in range(3)]
+
+    class Credentials:
+        def authorize(self, http):
+            return http
+
+    gcal.credentials = Credentials()
+
+    def page(day, page_token=None):
+        events = {'items': [
+            {'start': {'dateTime': '2019-01-0%dT14:15:00Z' % day},
+             'end': {'dateTime': '2019-01-08T15:15:00Z'}}]}
+        if page_token:
+            events['nextPageToken'] = page_token
+        return events
+
+    def get_events_batch(queries):
+        assert all(params['orderBy'] == 'startTime' for _, params in queries)
+        return [(page(1, 'token'), None) for _ in queries]
+
+    https = []
+
+    def retry_with_backoff(request):
+        https.append(gcal._thread_local.http)
+        # later calendars get earlier events
+        return page(7 - int(request.uri.split('/calendars/cal')[1][0]))
+
+    monkeypatch.setattr(gcal, 'get_events_batch', get_events_batch)
+    monkeypatch.setattr(gcal, '_retry_with_backoff', retry_with_backoff)
+    event_list = gcal._search_for_events(None, None, None)
+    # the second pages are fetched by workers on connections of their own
+    assert len(https) == 3
+    assert all(isinstance(http, httplib2.Http) for http in https)
+    assert len(event_list) == 6
+    assert event_list == sorted(event_list, key=lambda e: e['s'])
+    # the main thread keeps using the shared connection
+    assert getattr(gcal._thread_local, 'http', None) is None
+
+
+def test_get_events_batch(PatchedGCalI, monkeypatch):
+    gcal = PatchedGCalI()
+
+    def execute_batch(requests):
+        # answer out of order, as the API is free to
+        for request, callback in reversed(requests):
+            callback(request.uri, None)
+
+    monkeypatch.setattr(gcal, '_execute_batch', execute_batch)
+    results = gcal.get_events_batch([('cal1', {'maxResults': 1}),
+                                     ('cal2', {})])
+    assert [exception for _, exception in results] == [None, None]
+    assert '/calendars/cal1/events?maxResults=1' in results[0][0]
+    assert '/calendars/cal2/events' in results[1][0]
+
+
+def test_stale_cache_revalidated(PatchedGCalI, tmpdir, monkeypatch):
+    gcal = PatchedGCalI(config_folder=str(tmpdir), refresh_cache=False)
+    gcal.options['use_cache'] = True
+    cals = [{'id': 'cal_id', 'accessRole': 'owner'}]
+    cache_file = str(tmpdir.join('cache'))
+    with open(cache_file, 'wb') as cache:
+        pickle.dump({'version': CACHE_SCHEMA_VERSION, 'mtime': 0,
+                     'etag': '"1"', 'all_cals': cals}, cache)
+
+    sent = []
+
+    def not_modified(request):
+        sent.append(request.headers.get('If-None-Match'))
+        raise HttpError(httplib2.Response({'status': 304}), b'')
+
+    monkeypatch.setattr(gcal, '_retry_with_backoff', not_modified)
+    get_cached(gcal)
+    assert sent == ['"1"']
+    assert gcal.all_cals == cals
+    with open(cache_file, 'rb') as cache:
+        assert pickle.load(cache)['mtime'] > 0
+
+    # a fresh cache is used without asking the server
+    sent.clear()
+    get_cached(gcal)
+    assert sent == []
+
+
+def test_retry_with_backoff(PatchedGCalI, monkeypatch):
+    gcal = PatchedGCalI()
+    content = (b'{"error": {"code": 403, "errors": '
+               b'[{"reason": "rateLimitExceeded"}]}}')
+
+    class Request:
+        calls = 0
+
+        def execute(self):
+            self.calls += 1
+            if self.calls == 1:
+                raise HttpError(httplib2.Response(
+                        {'status': 403, 'retry-after': '7'}), content)
+            return 'ok'
+
+    slept = []
+    monkeypatch.setattr('gcalcli.gcal.time.sleep', slept.append)
+    assert gcal._retry_with_backoff(Request()) == 'ok'
+    assert slept == [7]
+
+
+def test_execute_batch_retries_rate_limited(PatchedGCalI, monkeypatch):
+    gcal = PatchedGCalI()
+    content = (b'{"error": {"code": 403, "errors": '
+               b'[{"reason": "userRateLimitExceeded"}]}}')
+    rate_limited = HttpError(httplib2.Response({'status': 403}), content)
+    failed = HttpError(httplib2.Response({'status': 404}), b'{}')
+
+    class Batch:
+        def __init__(self):
+            self.requests = []
+
+        def add(self, request, callback):
+            self.requests.append((request, callback))
+
+        def execute(self):
+            for request, callback in self.requests:
+                callback(None, None, {'ok': None, 'limited': rate_limited,
+                                      'missing': failed}[request])
+
+    class Service:
+        def new_batch_http_request(self):
+            return Batch()
+
+    retried = []
+
+    def retry_with_backoff(request):
+        if isinstance(request, Batch):
+            return request.execute()
+        retried.append(request)
+        return 'response'
+
+    monkeypatch.setattr(gcal, 'get_cal_service', Service)
+    monkeypatch.setattr(gcal, '_retry_with_backoff', retry_with_backoff)
+    results = {}
+    execute_batch(gcal, [
+        (name, lambda response, exception, name=name:
+         results.__setitem__(name, (response, exception)))
+        for name in ('ok', 'limited', 'missing')])
+
+    # the rate limited request is sent again rather than dropped
+    assert retried == ['limited']
+    assert results == {'ok': (None, None), 'limited': ('response', None),
+                       'missing': (None, failed)}
+
+
+def test_print_json_fallback(capsys, monkeypatch):
+    monkeypatch.setattr('gcalcli.gcal.orjson', None)
+    obj = {'summary': 'caf\u00e9', 'items': [1, None]}
+    _print_json(obj)
+    # same formatting as before orjson support was added
+    assert capsys.readouterr().out == json.dumps(obj) + '\n'
+
+
+def test_tsv(capsys, PatchedGCalI, default_options):
+    gcal = PatchedGCalI(**default_options)
+    event = {'summary': 'multi\nline',
+             'start': {'dateTime': '2019-01-08T14:15:00Z'},
+             'end': {'dateTime': '2019-01-08T15:15:00Z'},
+             's': datetime(2019, 1, 8, 14, 15, tzinfo=tzutc()),
+             'e': datetime(2019, 1, 8, 15, 15, tzinfo=tzutc())}
+    gcal._tsv(event['s'], [event])
+    captured = capsys.readouterr()
+    assert captured.out == (
+            'start_date\tstart_time\tend_date\tend_time\ttitle\n'
+            '2019-01-08\t14:15\t2019-01-08\t15:15\tmulti\\nline\n')
+
+
+def test_set_event_start_end(PatchedGCalI):
+    gcal = PatchedGCalI(allday=False)
+    event = {'gcalcli_cal': {'timeZone': 'UTC'}}
+    event = gcal._SetEventStartEnd('2019-01-08T14:15:00+00:00',
+                                   '2019-01-08T15:45:00+00:00', event)
+    assert event['s'] == datetime(2019, 1, 8, 14, 15, tzinfo=tzutc())
+    assert event['e'] - event['s'] == timedelta(minutes=90)
+    assert event['end']['dateTime'] == '2019-01-08T15:45:00+00:00'
+
+
 def test_parse_reminder():
     MINS_PER_DAY = 60 * 24
     MINS_PER_WEEK = MINS_PER_DAY * 7
@@ -253,6 +517,8 @@ def test_parse_reminder():
 
     rem = 'invalid reminder'
     assert parse_reminder(rem) is None
+    assert parse_reminder('') is None
+    assert parse_reminder('.') is None
 
 
 def test_parse_cal_names(PatchedGCalI):
@@ -286,7 +552,25 @@ def test_iterate_events(capsys, PatchedGCalI):
     gcal = PatchedGCalI()
     assert gcal._iterate_events(gcal.now, []) == 0
 
-    # TODO: add some events to a list and assert their selection
+    cal = {'id': 'cal_id'}
+    declined = [{'email': 'cal_id', 'responseStatus': 'declined'}]
+    event_list = [
+        {'s': gcal.now - timedelta(days=1), 'gcalcli_cal': cal},
+        {'s': gcal.now + timedelta(days=1), 'gcalcli_cal': cal,
+         'attendees': declined},
+        {'s': gcal.now + timedelta(days=2), 'gcalcli_cal': cal},
+    ]
+    printed = []
+    gcal._PrintEvent = lambda event, prefix: printed.append(event)
+
+    gcal.options['ignore_started'] = True
+    gcal.options['ignore_declined'] = True
+    assert gcal._iterate_events(gcal.now, event_list) == 1
+    assert printed == event_list[2:]
+
+    gcal.options['ignore_started'] = False
+    gcal.options['ignore_declined'] = False
+    assert gcal._iterate_events(gcal.now, event_list) == 3
 
 
 def test_next_cut(PatchedGCalI):
@@ -1,8 +1,9 @@
 import pytest
 
-from gcalcli.validators import (PARSABLE_DATE, PARSABLE_DURATION, REMINDER,
-                                STR_ALLOW_EMPTY, STR_NOT_EMPTY, STR_TO_INT,
-                                VALID_COLORS, validate_input, ValidationError)
+from gcalcli.validators import (get_override_color_id, PARSABLE_DATE,
+                                PARSABLE_DURATION, REMINDER, STR_ALLOW_EMPTY,
+                                STR_NOT_EMPTY, STR_TO_INT, VALID_COLORS,
+                                validate_input, ValidationError)
 
 # Tests required:
 #
@@ -47,6 +48,11 @@ def test_any_string_parsable_by_dateutil(monkeypatch):
     monkeypatch.setattr("builtins.input", lambda: "2nd January")
     validate_input(PARSABLE_DATE) == "2nd January"
 
+    # anything the parsers accept passes the character check too
+    for date in ("2019-01-01T10:00:00+02:00", "2019-01-01\t"):
+        monkeypatch.setattr("builtins.input", lambda: date)
+        assert validate_input(PARSABLE_DATE) == date
+
 
 def test_any_string_parsable_by_parsedatetime(monkeypatch):
     # non-date raises ValidationError
@@ -66,6 +72,11 @@ def test_any_string_parsable_by_parsedatetime(monkeypatch):
     monkeypatch.setattr("builtins.input", lambda: "1h2m")
     assert validate_input(PARSABLE_DURATION) == "1h2m"
 
+    # characters no duration is made of are rejected before parsing
+    monkeypatch.setattr("builtins.input", lambda: "1h;2m")
+    with pytest.raises(ValidationError):
+        validate_input(PARSABLE_DURATION)
+
 
 def test_string_can_be_cast_to_int(monkeypatch):
     # non int-castable string raises ValidationError
@@ -97,6 +108,13 @@ def test_for_valid_colour_name(monkeypatch):
     validate_input(VALID_COLORS) == ""
 
 
+def test_override_color_id():
+    assert get_override_color_id('lavender') == '1'
+    assert get_override_color_id('tomato') == '11'
+    with pytest.raises(ValueError):
+        get_override_color_id('purple')
+
+
 def test_any_string_and_blank(monkeypatch):
     # string passes
     monkeypatch.setattr("builtins.input", lambda: "TEST")
@@ -35,6 +35,14 @@ def test_red_msg():
     assert out.read() == '\033[0;31mmsg\033[0m'
 
 
+def test_msg_many():
+    cp = Printer()
+    out = StringIO()
+    cp.msg_many([('a', 'red'), ('b', 'default')], file=out)
+    out.seek(0)
+    assert out.read() == '\033[0;31ma\033[0m\033[0mb\033[0m'
+
+
 def test_err_msg(monkeypatch):
     err = StringIO()
     monkeypatch.setattr(sys, 'stderr', err)
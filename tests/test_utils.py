@@ -10,6 +10,28 @@ def test_get_time_from_str():
     assert utils.get_time_from_str('7am tomorrow')
 
 
+def test_get_time_from_str_cached():
+    utils._dateutil_parse.cache_clear()
+    assert utils.get_time_from_str('Jan 1 2019 10am') == \
+        utils.get_time_from_str('Jan 1 2019 10am')
+    assert utils._dateutil_parse.cache_info().hits == 1
+
+
+def test_get_time_from_iso_str():
+    for when in ('2019-01-01', '2019-01-01T10:00',
+                 '2019-01-01T10:00:00+02:00', '2019-01-01 10:00:00.5'):
+        expected = utils.dateutil_parse(
+                when, default=datetime(2000, 1, 1, tzinfo=utils.TZLOCAL))
+        assert utils.get_time_from_str(when) == expected
+
+
+def test_fuzzy_parsers():
+    struct, result = utils.fuzzy_date_parse('tomorrow')
+    assert result
+    with pytest.raises(AttributeError):
+        utils.not_an_attribute
+
+
 def test_get_parsed_timedelta_from_str():
     assert utils.get_timedelta_from_str('3.5h') == timedelta(
                                         hours=3, minutes=30)
@@ -27,9 +49,14 @@ def test_get_parsed_timedelta_from_str():
     assert utils.get_timedelta_from_str(
         '2 days 1 hour 2 minutes 40 seconds') == timedelta(
                                         days=2, hours=1, minutes=2, seconds=40)
+    assert utils.get_timedelta_from_str('90 mins') == timedelta(minutes=90)
+    assert utils.DURATION_REGEX.fullmatch('2 days 1 hour 2 minutes 40 seconds')
     with pytest.raises(ValueError) as ve:
         utils.get_timedelta_from_str('junk')
     assert str(ve.value) == "Duration is invalid: junk"
+    for junk in ('.', 'in a bit' * 10):
+        with pytest.raises(ValueError):
+            utils.get_timedelta_from_str(junk)
 
 
 def test_get_times_from_duration():
@@ -69,6 +96,26 @@ def test_days_since_epoch():
     assert utils.days_since_epoch(datetime(1970, 12, 31)) == 364
 
 
+def test_agenda_time_fmt():
+    assert utils.agenda_time_fmt(datetime(2019, 1, 1, 9, 5), True) == '9:05'
+    assert utils.agenda_time_fmt(datetime(2019, 1, 1, 0, 5), True) == '0:05'
+    assert utils.agenda_time_fmt(datetime(2019, 1, 1, 15, 0), True) == \
+        '15:00'
+    assert utils.agenda_time_fmt(datetime(2019, 1, 1, 0, 5), False) == \
+        '12:05' + datetime(2019, 1, 1, 0, 5).strftime('%p').lower()
+    assert utils.agenda_time_fmt(datetime(2019, 1, 1, 15, 0), False) == \
+        '3:00' + datetime(2019, 1, 1, 15, 0).strftime('%p').lower()
+
+
+def test_is_all_day():
+    midnight = datetime(2019, 1, 1)
+    assert utils.is_all_day({'s': midnight, 'e': midnight})
+    assert not utils.is_all_day(
+            {'s': midnight, 'e': midnight.replace(minute=30)})
+    assert not utils.is_all_day(
+            {'s': midnight.replace(hour=10), 'e': midnight})
+
+
 def test_set_locale():
     with pytest.raises(ValueError):
         utils.set_locale('not_a_real_locale')